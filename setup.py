@@ -58,6 +58,11 @@ setup(
             "sphinx-rtd-theme>=1.2.0",
             "myst-parser>=1.0.0",
         ],
+        "speedups": [
+            "uvloop>=0.17.0; sys_platform != 'win32'",
+            "orjson>=3.8.0",
+            "blake3>=0.3.0",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -71,6 +76,7 @@ setup(
             "templates/*.yaml",
             "templates/*.json",
             "config/*.yaml",
+            "workflows/*.yaml",
         ],
     },
     zip_safe=False,
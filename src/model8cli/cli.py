@@ -19,6 +19,13 @@ from rich.text import Text
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    uvloop = None
+    UVLOOP_AVAILABLE = False
+
 from .core.config import Config
 from .core.api import OpenRouterClient
 from .core.models import ModelManager
@@ -30,11 +37,12 @@ from .tools.git_tools import GitTools
 from .tools.github_tools import GitHubTools
 from .tools.system_tools import SystemTools
 from .tools.code_tools import CodeTools
-from .tools.knowledge_tools import KnowledgeTools
+from .tools.knowledge_tools import KnowledgeTools, parse_tags
 from .tools.workflow_tools import WorkflowTools
 from .tools.ollama_tools import OllamaTools
 from .ui.interactive import InteractiveMode
 from .ui.formatting import RichFormatter
+from .utils.helpers import YamlSafeLoader
 
 # Initialize console and logger
 console = Console()
@@ -80,6 +88,10 @@ def main(ctx, config: Optional[str], model: Optional[str], verbose: bool, debug:
     log_level = "DEBUG" if debug else ("INFO" if verbose else "WARNING")
     setup_logging(log_level)
 
+    # Every asyncio.run() below uses the libuv-based loop when uvloop is installed
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     # Check if we're setting an API key - if so, skip validation
     if ctx.invoked_subcommand == 'set-api-key':
         os.environ["SKIP_API_KEY_VALIDATION"] = "1"
@@ -624,7 +636,7 @@ def search(ctx, query: str, category: str, limit: int):
 @click.pass_context
 def add(ctx, title: str, content: str, category: str, tags: str):
     """Add knowledge entry"""
-    tags_list = tags.split(',') if tags else None
+    tags_list = parse_tags(tags) if tags else None
     asyncio.run(knowledge_add_command(ctx.obj['config'], title, content, category, tags_list))
 
 
@@ -1365,7 +1377,10 @@ Be helpful and use the appropriate tools to accomplish the user's request!"""
         session_manager.add_message("system", system_prompt)
 
         # Process the request
-        await interactive._process_user_message(request)
+        try:
+            await interactive._process_user_message(request)
+        finally:
+            await api_client.close()
 
     except Exception as e:
         console.print(f"[red]❌ Error processing request: {e}[/red]")
@@ -1417,7 +1432,7 @@ async def auto_switch_model_command(config: Config, list_models: bool = False):
         if config_path.exists():
             import yaml
             with open(config_path, 'r') as f:
-                config_data = yaml.safe_load(f) or {}
+                config_data = yaml.load(f, Loader=YamlSafeLoader) or {}
         else:
             config_data = {}
 
@@ -1470,7 +1485,7 @@ async def simple_switch_model_command(list_models: bool = False):
         if config_path.exists():
             try:
                 with open(config_path, 'r') as f:
-                    config_data = yaml.safe_load(f) or {}
+                    config_data = yaml.load(f, Loader=YamlSafeLoader) or {}
                 current_model = config_data.get("models", {}).get("default")
             except:
                 pass
@@ -1492,7 +1507,7 @@ async def simple_switch_model_command(list_models: bool = False):
 
         if config_path.exists():
             with open(config_path, 'r') as f:
-                config_data = yaml.safe_load(f) or {}
+                config_data = yaml.load(f, Loader=YamlSafeLoader) or {}
         else:
             config_data = {}
 
@@ -1527,7 +1542,7 @@ async def list_available_models_command(free_only: bool = False, update: bool =
             if config_path.exists():
                 import yaml
                 with open(config_path, 'r') as f:
-                    config_data = yaml.safe_load(f) or {}
+                    config_data = yaml.load(f, Loader=YamlSafeLoader) or {}
                 api_key = config_data.get("api", {}).get("openrouter_key")
 
         if not api_key:
@@ -120,8 +120,18 @@ class OpenRouterClient:
                 "Content-Type": "application/json",
             },
             timeout=httpx.Timeout(config.api_timeout),
+            # Keep connections alive between turns so each message skips the handshake
+            limits=httpx.Limits(
+                max_connections=32,
+                max_keepalive_connections=8,
+                keepalive_expiry=60.0,
+            ),
         )
         
+        # Provider clients, created on first use and reused for the client's lifetime
+        self._groq_client = None
+        self._ollama_client = None
+        
         # Rate limiting
         self.throttler = Throttler(rate_limit=config.rate_limit_per_minute, period=60)
         
@@ -140,6 +150,21 @@ class OpenRouterClient:
     async def close(self):
         """Close the HTTP client"""
         await self.client.aclose()
+        
+        if self._groq_client is not None:
+            await self._groq_client.close()
+            self._groq_client = None
+        
+        if self._ollama_client is not None:
+            await self._ollama_client.close()
+            self._ollama_client = None
+    
+    async def warm_up(self):
+        """Open a pooled connection to the API ahead of the next request"""
+        try:
+            await self.client.head("/models")
+        except httpx.HTTPError as e:
+            logger.debug("Connection warm-up failed", error=str(e))
     
     async def _make_request(
         self,
@@ -257,6 +282,7 @@ class OpenRouterClient:
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
         stream: bool = False,
+        response_format: Optional[Dict[str, Any]] = None,
     ) -> Union[ChatResponse, AsyncGenerator[Dict[str, Any], None]]:
         """
         Create a chat completion - routes to appropriate provider
@@ -305,13 +331,16 @@ class OpenRouterClient:
         if tool_choice:
             request_data["tool_choice"] = tool_choice
         
+        if response_format:
+            request_data["response_format"] = response_format
+        
         # Basic request validation
         if not request_data.get("messages"):
             raise ValueError("Messages are required")
         
         try:
             if stream:
-                return self._make_request("POST", "/chat/completions", request_data, stream=True)
+                return await self._make_request("POST", "/chat/completions", request_data, stream=True)
             else:
                 response = await self._make_request("POST", "/chat/completions", request_data)
 
@@ -346,7 +375,9 @@ class OpenRouterClient:
             ollama_model = model.replace("ollama/", "")
 
             # Initialize Ollama client
-            ollama_client = OllamaClient()
+            if self._ollama_client is None:
+                self._ollama_client = OllamaClient()
+            ollama_client = self._ollama_client
 
             # Check if Ollama is available
             if not await ollama_client.is_available():
@@ -371,8 +402,6 @@ class OpenRouterClient:
                 tool_choice=tool_choice
             )
 
-            await ollama_client.close()
-
             # Convert Ollama response to OpenRouter format
             # response.message is a dict with 'role' and 'content' keys
             message = {
@@ -403,6 +432,14 @@ class OpenRouterClient:
             logger.error("Ollama completion failed", error=str(e), model=model)
             raise OpenRouterError(f"Ollama completion failed: {e}")
 
+    def is_openrouter_model(self, model: str) -> bool:
+        """Check if a model is served by OpenRouter rather than Ollama or Groq"""
+        return not (
+            model.startswith("ollama/")
+            or model.startswith("groq/")
+            or self._is_groq_model(model)
+        )
+
     def _is_groq_model(self, model: str) -> bool:
         """Check if a model is a Groq model"""
         from .groq_client import GroqClient
@@ -426,7 +463,9 @@ class OpenRouterClient:
             groq_model = model.replace("groq/", "")
 
             # Initialize Groq client
-            groq_client = GroqClient(self.config)
+            if self._groq_client is None:
+                self._groq_client = GroqClient(self.config)
+            groq_client = self._groq_client
 
             # Make request to Groq
             response = await groq_client.chat_completion(
@@ -439,7 +478,6 @@ class OpenRouterClient:
                 stream=stream
             )
 
-            await groq_client.close()
             return response
 
         except Exception as e:
@@ -15,6 +15,8 @@ from dotenv import load_dotenv
 
 import structlog
 
+from ..utils.helpers import YamlSafeLoader
+
 logger = structlog.get_logger(__name__)
 
 
@@ -193,7 +195,7 @@ class Config:
         if self.config_path.exists():
             try:
                 with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f) or {}
+                    config_data = yaml.load(f, Loader=YamlSafeLoader) or {}
                 self._apply_config_data(config_data)
                 logger.debug("Configuration loaded from file")
             except Exception as e:
@@ -446,7 +448,7 @@ class Config:
         try:
             if self.config_path.exists():
                 with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f) or {}
+                    config_data = yaml.load(f, Loader=YamlSafeLoader) or {}
             else:
                 config_data = {}
 
@@ -470,7 +472,7 @@ class Config:
         try:
             if self.config_path.exists():
                 with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f) or {}
+                    config_data = yaml.load(f, Loader=YamlSafeLoader) or {}
             else:
                 config_data = {}
 
@@ -494,7 +496,7 @@ class Config:
         try:
             if self.config_path.exists():
                 with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f) or {}
+                    config_data = yaml.load(f, Loader=YamlSafeLoader) or {}
             else:
                 config_data = {}
 
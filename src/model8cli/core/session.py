@@ -8,7 +8,7 @@ import json
 import time
 import uuid
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 import asyncio
@@ -234,6 +234,7 @@ class SessionManager:
         model: Optional[str] = None,
         tool_calls: Optional[List[Dict[str, Any]]] = None,
         tool_call_id: Optional[str] = None,
+        autosave: bool = True,
     ) -> SessionMessage:
         """Add a message to the current session"""
         if not self.current_session:
@@ -262,11 +263,27 @@ class SessionManager:
         self.current_session.messages.append(message)
         
         # Auto-save after adding message
-        self._save_session(self.current_session)
+        if autosave:
+            self._save_session(self.current_session)
         
         logger.debug("Message added to session", role=role, tokens=tokens)
         return message
     
+    def add_messages_batch(
+        self,
+        messages: List[Tuple[str, str, Dict[str, Any]]],
+    ) -> List[SessionMessage]:
+        """Add several (role, content, kwargs) messages and save the session once"""
+        added = [
+            self.add_message(role, content, autosave=False, **kwargs)
+            for role, content, kwargs in messages
+        ]
+        
+        if self.current_session:
+            self._save_session(self.current_session)
+        
+        return added
+    
     def get_context_messages(
         self,
         max_tokens: Optional[int] = None,
@@ -347,6 +347,9 @@ class ToolRegistry:
         self.tools: Dict[str, BaseTool] = {}
         self.categories: Dict[ToolCategory, List[str]] = {}
         
+        # Bumped on every register/unregister so callers can cache derived data
+        self.version = 0
+        
         logger.info("Tool registry initialized")
     
     def register_tool(self, tool: BaseTool):
@@ -363,6 +366,7 @@ class ToolRegistry:
         if tool.name not in self.categories[tool.category]:
             self.categories[tool.category].append(tool.name)
         
+        self.version += 1
         logger.info("Tool registered", tool=tool.name, category=tool.category.value)
     
     def unregister_tool(self, tool_name: str):
@@ -379,6 +383,7 @@ class ToolRegistry:
             if tool_name in self.categories[tool.category]:
                 self.categories[tool.category].remove(tool_name)
         
+        self.version += 1
         logger.info("Tool unregistered", tool=tool_name)
     
     def get_tool(self, tool_name: str) -> Optional[BaseTool]:
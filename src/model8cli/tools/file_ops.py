@@ -4,7 +4,9 @@ File Operations Tools for 200Model8CLI
 Comprehensive file operations including read, write, edit, search, backup, and diff.
 """
 
+import io
 import os
+import asyncio
 import shutil
 import difflib
 from pathlib import Path
@@ -12,13 +14,14 @@ from typing import Dict, List, Optional, Any, Union
 import re
 import json
 import time
+from functools import partial
 
 import aiofiles
 import structlog
 
 from .base import BaseTool, ToolCategory, ToolParameter, ToolResult
 from ..core.config import Config
-from ..utils.helpers import get_file_info, format_file_size, detect_file_language, is_binary_file
+from ..utils.helpers import get_file_info, format_file_size, detect_file_language, is_binary_file, scan_file
 
 logger = structlog.get_logger(__name__)
 
@@ -82,14 +85,17 @@ class ReadFileTool(BaseTool):
             if not file_path.is_file():
                 return ToolResult(success=False, error=f"Path is not a file: {path}")
             
-            # Check if binary file
-            if is_binary_file(file_path):
+            # One read pass sniffs, hashes and loads the file
+            scan = await asyncio.get_running_loop().run_in_executor(
+                None, partial(scan_file, file_path, keep_content=True)
+            )
+            if scan["is_binary"]:
                 return ToolResult(success=False, error="Cannot read binary file")
             
-            # Read file
-            async with aiofiles.open(file_path, 'r', encoding=encoding) as f:
-                content = await f.read()
+            # Decode like a text-mode open would, including newline translation
+            content = io.TextIOWrapper(io.BytesIO(scan["content"]), encoding=encoding).read()
             
+            # scan_file cached the digest, so this doesn't hash the file again
             file_info = get_file_info(file_path)
             
             return ToolResult(
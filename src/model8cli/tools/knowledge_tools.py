@@ -12,14 +12,32 @@ from pathlib import Path
 from dataclasses import dataclass
 from datetime import datetime
 import hashlib
-
-import structlog
+import re
+import time
 
 from .base import BaseTool, ToolResult, ToolCategory
 from ..core.config import Config
 from ..utils.security import SecurityValidator
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# How long generated lesson content stays valid in the lesson cache
+LESSON_CACHE_TTL = 7 * 24 * 3600
+
+# Bytes of the database file SQLite may memory-map
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+# Bumped whenever the knowledge_fts layout changes so it gets rebuilt
+FTS_SCHEMA_VERSION = 1
+
+# A tag runs from its first non-blank character up to the next comma
+_TAG_RE = re.compile(r"[^,\s][^,]*")
 
-logger = structlog.get_logger(__name__)
+
+def parse_tags(text: str) -> List[str]:
+    """Parse a comma-separated tag string, dropping blank tags"""
+    return [tag.rstrip() for tag in _TAG_RE.findall(text)]
 
 
 @dataclass
@@ -34,6 +52,29 @@ class KnowledgeEntry:
     updated_at: str
     source: str
     metadata: Dict[str, Any]
+    
+    @classmethod
+    def create(
+        cls,
+        title: str,
+        content: str,
+        category: str,
+        tags: Optional[List[str]] = None,
+        source: str = "user_input",
+    ) -> "KnowledgeEntry":
+        """Create a new entry with an ID derived from its title and content"""
+        now = datetime.now().isoformat()
+        return cls(
+            id=hashlib.md5(f"{title}{content}".encode()).hexdigest(),
+            title=title,
+            content=content,
+            category=category,
+            tags=tags or [],
+            created_at=now,
+            updated_at=now,
+            source=source,
+            metadata={}
+        )
 
 
 class KnowledgeDatabase:
@@ -44,9 +85,19 @@ class KnowledgeDatabase:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection tuning applied"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        return conn
+    
     def _init_database(self):
         """Initialize the knowledge database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS knowledge_entries (
                     id TEXT PRIMARY KEY,
@@ -69,9 +120,25 @@ class KnowledgeDatabase:
                 CREATE INDEX IF NOT EXISTS idx_tags ON knowledge_entries(tags)
             """)
             
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_created ON knowledge_entries(created_at DESC)
+            """)
+            
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_category_title ON knowledge_entries(category, title, id)
+            """)
+            
+            # Older databases indexed the FTS table without linking its rowids
+            # to knowledge_entries; drop it so it is rebuilt below
+            if conn.execute("PRAGMA user_version").fetchone()[0] < FTS_SCHEMA_VERSION:
+                for trigger in ("knowledge_fts_insert", "knowledge_fts_update", "knowledge_fts_delete"):
+                    conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+                conn.execute("DROP TABLE IF EXISTS knowledge_fts")
+            
             conn.execute("""
                 CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
-                    id, title, content, category, tags, content=knowledge_entries
+                    title, content, category, tags,
+                    content=knowledge_entries, content_rowid=rowid
                 )
             """)
             
@@ -79,34 +146,59 @@ class KnowledgeDatabase:
             conn.execute("""
                 CREATE TRIGGER IF NOT EXISTS knowledge_fts_insert AFTER INSERT ON knowledge_entries
                 BEGIN
-                    INSERT INTO knowledge_fts(id, title, content, category, tags)
-                    VALUES (new.id, new.title, new.content, new.category, new.tags);
+                    INSERT INTO knowledge_fts(rowid, title, content, category, tags)
+                    VALUES (new.rowid, new.title, new.content, new.category, new.tags);
                 END
             """)
             
             conn.execute("""
                 CREATE TRIGGER IF NOT EXISTS knowledge_fts_update AFTER UPDATE ON knowledge_entries
                 BEGIN
-                    UPDATE knowledge_fts SET title=new.title, content=new.content, 
-                           category=new.category, tags=new.tags WHERE id=new.id;
+                    INSERT INTO knowledge_fts(knowledge_fts, rowid, title, content, category, tags)
+                    VALUES ('delete', old.rowid, old.title, old.content, old.category, old.tags);
+                    INSERT INTO knowledge_fts(rowid, title, content, category, tags)
+                    VALUES (new.rowid, new.title, new.content, new.category, new.tags);
                 END
             """)
             
             conn.execute("""
                 CREATE TRIGGER IF NOT EXISTS knowledge_fts_delete AFTER DELETE ON knowledge_entries
                 BEGIN
-                    DELETE FROM knowledge_fts WHERE id=old.id;
+                    INSERT INTO knowledge_fts(knowledge_fts, rowid, title, content, category, tags)
+                    VALUES ('delete', old.rowid, old.title, old.content, old.category, old.tags);
                 END
             """)
+            
+            if conn.execute("PRAGMA user_version").fetchone()[0] < FTS_SCHEMA_VERSION:
+                conn.execute("INSERT INTO knowledge_fts(knowledge_fts) VALUES ('rebuild')")
+                conn.execute(f"PRAGMA user_version = {FTS_SCHEMA_VERSION}")
+            
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lesson_cache (
+                    topic_id TEXT NOT NULL,
+                    lesson_title TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    expires_at INTEGER NOT NULL,
+                    PRIMARY KEY (topic_id, lesson_title, model, prompt_hash)
+                )
+            """)
     
     def add_entry(self, entry: KnowledgeEntry) -> bool:
         """Add a knowledge entry"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute("""
-                    INSERT OR REPLACE INTO knowledge_entries 
+                    INSERT INTO knowledge_entries 
                     (id, title, content, category, tags, created_at, updated_at, source, metadata)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        title=excluded.title, content=excluded.content,
+                        category=excluded.category, tags=excluded.tags,
+                        updated_at=excluded.updated_at, source=excluded.source,
+                        metadata=excluded.metadata
                 """, (
                     entry.id, entry.title, entry.content, entry.category,
                     json.dumps(entry.tags), entry.created_at, entry.updated_at,
@@ -120,20 +212,20 @@ class KnowledgeDatabase:
     def search_entries(self, query: str, category: Optional[str] = None, limit: int = 10) -> List[KnowledgeEntry]:
         """Search knowledge entries using FTS"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 if category:
                     cursor = conn.execute("""
-                        SELECT k.* FROM knowledge_entries k
-                        JOIN knowledge_fts f ON k.id = f.id
+                        SELECT k.* FROM knowledge_fts f
+                        JOIN knowledge_entries k ON k.rowid = f.rowid
                         WHERE knowledge_fts MATCH ? AND k.category = ?
-                        ORDER BY rank LIMIT ?
+                        ORDER BY f.rank LIMIT ?
                     """, (query, category, limit))
                 else:
                     cursor = conn.execute("""
-                        SELECT k.* FROM knowledge_entries k
-                        JOIN knowledge_fts f ON k.id = f.id
+                        SELECT k.* FROM knowledge_fts f
+                        JOIN knowledge_entries k ON k.rowid = f.rowid
                         WHERE knowledge_fts MATCH ?
-                        ORDER BY rank LIMIT ?
+                        ORDER BY f.rank LIMIT ?
                     """, (query, limit))
                 
                 entries = []
@@ -150,10 +242,49 @@ class KnowledgeDatabase:
             logger.error("Failed to search knowledge entries", error=str(e))
             return []
     
+    def get_cached_lesson(
+        self, topic_id: str, lesson_title: str, model: str, prompt_hash: str
+    ) -> Optional[str]:
+        """Get cached lesson content if present and not expired"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute("""
+                    SELECT content FROM lesson_cache
+                    WHERE topic_id = ? AND lesson_title = ? AND model = ?
+                      AND prompt_hash = ? AND expires_at > ?
+                """, (topic_id, lesson_title, model, prompt_hash, int(time.time()))).fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            logger.error("Failed to read lesson cache", error=str(e))
+            return None
+    
+    def cache_lesson(
+        self,
+        topic_id: str,
+        lesson_title: str,
+        model: str,
+        prompt_hash: str,
+        content: str,
+        ttl: int = LESSON_CACHE_TTL,
+    ) -> bool:
+        """Store generated lesson content in the lesson cache"""
+        now = int(time.time())
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO lesson_cache
+                    (topic_id, lesson_title, model, prompt_hash, content, created_at, expires_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (topic_id, lesson_title, model, prompt_hash, content, now, now + ttl))
+                return True
+        except Exception as e:
+            logger.error("Failed to write lesson cache", error=str(e))
+            return False
+    
     def get_categories(self) -> List[str]:
         """Get all categories"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("SELECT DISTINCT category FROM knowledge_entries ORDER BY category")
                 return [row[0] for row in cursor.fetchall()]
         except Exception as e:
@@ -276,22 +407,7 @@ class AddKnowledgeTool(BaseTool):
         source: str = "user_input"
     ) -> ToolResult:
         try:
-            # Generate ID from title and content
-            entry_id = hashlib.md5(f"{title}{content}".encode()).hexdigest()
-            
-            now = datetime.now().isoformat()
-            
-            entry = KnowledgeEntry(
-                id=entry_id,
-                title=title,
-                content=content,
-                category=category,
-                tags=tags or [],
-                created_at=now,
-                updated_at=now,
-                source=source,
-                metadata={}
-            )
+            entry = KnowledgeEntry.create(title, content, category, tags, source)
             
             success = self.db.add_entry(entry)
             
@@ -299,7 +415,7 @@ class AddKnowledgeTool(BaseTool):
                 return ToolResult(
                     success=True,
                     result={
-                        "id": entry_id,
+                        "id": entry.id,
                         "title": title,
                         "category": category,
                         "tags": tags or [],
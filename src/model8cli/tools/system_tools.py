@@ -5,6 +5,7 @@ Provides system operations, command execution, and environment management.
 """
 
 import asyncio
+import functools
 import os
 import sys
 import subprocess
@@ -104,13 +105,14 @@ class ExecuteCommandTool(BaseTool):
             if not self.security.validate_file_path(work_dir):
                 return ToolResult(success=False, error="Working directory validation failed")
 
-            # Execute command safely
-            result = self.security.safe_execute_command(
+            # Execute command safely; subprocess.run blocks, so keep it off the event loop
+            result = await asyncio.get_running_loop().run_in_executor(None, functools.partial(
+                self.security.safe_execute_command,
                 command.split(),
                 cwd=work_dir,
                 timeout=timeout,
                 capture_output=capture_output
-            )
+            ))
             
             return ToolResult(
                 success=result.returncode == 0,
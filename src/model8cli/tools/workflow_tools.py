@@ -184,7 +184,12 @@ class CreateWorkflowTool(BaseTool):
                         "tool": {"type": "string"},
                         "parameters": {"type": "object"},
                         "condition": {"type": "string"},
-                        "on_failure": {"type": "string", "enum": ["stop", "continue", "retry"]}
+                        "on_failure": {"type": "string", "enum": ["stop", "continue", "retry"]},
+                        "depends_on": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "IDs of steps that must finish first (default: the previous step)"
+                        }
                     },
                     "required": ["id", "name", "tool", "parameters"]
                 }
@@ -225,7 +230,8 @@ class CreateWorkflowTool(BaseTool):
                     tool=step_dict["tool"],
                     parameters=step_dict["parameters"],
                     condition=step_dict.get("condition"),
-                    on_failure=step_dict.get("on_failure", "stop")
+                    on_failure=step_dict.get("on_failure", "stop"),
+                    depends_on=step_dict.get("depends_on")
                 )
                 workflow_steps.append(step)
             
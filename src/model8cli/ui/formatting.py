@@ -6,6 +6,8 @@ Provides rich terminal formatting for messages, code, and tool results.
 
 import json
 import re
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional
 
 from rich.console import Console
@@ -23,67 +25,159 @@ from ..utils.helpers import extract_code_blocks, detect_file_language
 
 logger = structlog.get_logger(__name__)
 
+# Markdown syntax markers, folded into a single pattern so one scan covers them all
+_MARKDOWN_PATTERN = re.compile(
+    "|".join([
+        r'#{1,6}\s',  # Headers
+        r'\*\*.*?\*\*',  # Bold
+        r'\*.*?\*',  # Italic
+        r'`.*?`',  # Inline code
+        r'```.*?```',  # Code blocks
+        r'\[.*?\]\(.*?\)',  # Links
+        r'^\s*[-*+]\s',  # Lists
+        r'^\s*\d+\.\s',  # Numbered lists
+    ]),
+    re.MULTILINE | re.DOTALL,
+)
+
+# Only the head and tail of very long outputs are probed for markdown
+_MARKDOWN_PROBE_HEAD = 4096
+_MARKDOWN_PROBE_TAIL = 512
+
+# Single-line text without any of these characters cannot be markdown
+_MARKDOWN_MARKER_CHARS = "*`#[-"
+
+# Color scheme, shared read-only by every formatter instance
+_COLOR_SCHEME = MappingProxyType({
+    "user": "blue",
+    "assistant": "green",
+    "system": "yellow",
+    "tool": "cyan",
+    "error": "red",
+    "success": "green",
+    "warning": "yellow",
+    "info": "blue",
+})
+
+# Static panel titles, parsed from markup once at import
+_USER_TITLE = Text.from_markup("[bold blue]You[/bold blue]")
+_ASSISTANT_MARKDOWN_TITLE = Text.from_markup("[bold green]Assistant[/bold green]")
+_ASSISTANT_TITLE = Text.from_markup("[bold green]200model8CLI[/bold green]")
+_SYSTEM_TITLE = Text.from_markup("[bold yellow]System[/bold yellow]")
+_ERROR_TITLE = Text.from_markup("[bold red]Error[/bold red]")
+_WARNING_TITLE = Text.from_markup("[bold yellow]Warning[/bold yellow]")
+_INFO_TITLE = Text.from_markup("[bold blue]Info[/bold blue]")
+_SUCCESS_TITLE = Text.from_markup("[bold green]Success[/bold green]")
+
+
+@lru_cache(maxsize=128)
+def _tool_title(tool_name: str) -> Text:
+    """Build the panel title for a tool result"""
+    return Text.from_markup(f"[bold cyan]🔧 {tool_name}[/bold cyan]")
+
+
+@lru_cache(maxsize=256)
+def _pretty_col(col: str) -> str:
+    """Turn a snake_case key into a title-cased column header"""
+    return col.replace("_", " ").title()
+
 
 class RichFormatter:
     """
     Rich terminal formatter for 200Model8CLI
     """
     
+    __slots__ = (
+        "config",
+        "console",
+        "colors",
+        "_is_tty",
+        "_stream_chunks",
+        "_stream_markdown",
+    )
+    
     def __init__(self, config: Config):
         self.config = config
         self.console = Console()
         
+        # Skip panels and ANSI colors when output is piped or redirected
+        self._is_tty = self.console.is_terminal
+        if not self._is_tty:
+            self.console = Console(no_color=True)
+        
         # Color scheme
-        self.colors = {
-            "user": "blue",
-            "assistant": "green", 
-            "system": "yellow",
-            "tool": "cyan",
-            "error": "red",
-            "success": "green",
-            "warning": "yellow",
-            "info": "blue",
-        }
+        self.colors = _COLOR_SCHEME
+        
+        # Incremental state for streamed assistant output
+        self._stream_chunks: List[str] = []
+        self._stream_markdown: Optional[Markdown] = None
     
     def display_user_message(self, content: str):
         """Display user message"""
-        self.console.print(Panel(
+        self.console.print(self._panel(
             content,
-            title="[bold blue]You[/bold blue]",
+            title=_USER_TITLE,
             border_style="blue",
             padding=(0, 1),
         ))
     
     def display_assistant_message(self, content: str):
         """Display 200model8CLI message with rich formatting"""
-        if self.config.ui.rich_formatting:
+        if self.config.ui.rich_formatting and not self._is_plain_text(content):
             # Try to render as markdown first
+            markdown = None
             try:
                 if self._contains_markdown(content):
                     markdown = Markdown(content)
-                    self.console.print(Panel(
-                        markdown,
-                        title="[bold green]Assistant[/bold green]",
-                        border_style="green",
-                        padding=(0, 1),
-                    ))
-                    return
             except Exception:
                 pass  # Fall back to plain text
+            
+            if markdown is not None:
+                self.console.print(self._panel(
+                    markdown,
+                    title=_ASSISTANT_MARKDOWN_TITLE,
+                    border_style="green",
+                    padding=(0, 1),
+                ))
+                return
         
         # Display as plain text
-        self.console.print(Panel(
+        self.console.print(self._panel(
             content,
-            title="[bold green]200model8CLI[/bold green]",
+            title=_ASSISTANT_TITLE,
             border_style="green",
             padding=(0, 1),
         ))
     
+    def begin_stream(self):
+        """Start a new streamed assistant turn"""
+        self._stream_chunks = []
+        self._stream_markdown = None
+    
+    def feed_stream(self, chunk: str) -> Markdown:
+        """Append a streamed chunk and return the Markdown for the content so far.
+        
+        Only the latest render is kept: every new chunk changes the text, so
+        older renders could never be reused and would only hold memory.
+        """
+        if chunk:
+            self._stream_chunks.append(chunk)
+            self._stream_markdown = None
+        
+        if self._stream_markdown is None:
+            self._stream_markdown = Markdown("".join(self._stream_chunks))
+        return self._stream_markdown
+    
+    def end_stream(self):
+        """Finish the current streamed assistant turn"""
+        self._stream_chunks = []
+        self._stream_markdown = None
+    
     def display_system_message(self, content: str):
         """Display system message"""
-        self.console.print(Panel(
+        self.console.print(self._panel(
             content,
-            title="[bold yellow]System[/bold yellow]",
+            title=_SYSTEM_TITLE,
             border_style="yellow",
             padding=(0, 1),
         ))
@@ -93,9 +187,9 @@ class RichFormatter:
         try:
             formatted_result = self._format_tool_result(tool_name, result)
             
-            self.console.print(Panel(
+            self.console.print(self._panel(
                 formatted_result,
-                title=f"[bold cyan]🔧 {tool_name}[/bold cyan]",
+                title=_tool_title(tool_name),
                 border_style="cyan",
                 padding=(0, 1),
             ))
@@ -103,9 +197,9 @@ class RichFormatter:
         except Exception as e:
             logger.warning("Failed to format tool result", tool=tool_name, error=str(e))
             # Fall back to JSON display
-            self.console.print(Panel(
+            self.console.print(self._panel(
                 JSON.from_data(result),
-                title=f"[bold cyan]🔧 {tool_name}[/bold cyan]",
+                title=_tool_title(tool_name),
                 border_style="cyan",
                 padding=(0, 1),
             ))
@@ -116,36 +210,36 @@ class RichFormatter:
         if details:
             content += f"\n[dim]{details}[/dim]"
         
-        self.console.print(Panel(
+        self.console.print(self._panel(
             content,
-            title="[bold red]Error[/bold red]",
+            title=_ERROR_TITLE,
             border_style="red",
             padding=(0, 1),
         ))
     
     def display_warning(self, message: str):
         """Display warning message"""
-        self.console.print(Panel(
+        self.console.print(self._panel(
             f"[yellow]{message}[/yellow]",
-            title="[bold yellow]Warning[/bold yellow]",
+            title=_WARNING_TITLE,
             border_style="yellow",
             padding=(0, 1),
         ))
     
     def display_info(self, message: str):
         """Display info message"""
-        self.console.print(Panel(
+        self.console.print(self._panel(
             f"[blue]{message}[/blue]",
-            title="[bold blue]Info[/bold blue]",
+            title=_INFO_TITLE,
             border_style="blue",
             padding=(0, 1),
         ))
     
     def display_success(self, message: str):
         """Display success message"""
-        self.console.print(Panel(
+        self.console.print(self._panel(
             f"[green]{message}[/green]",
-            title="[bold green]Success[/bold green]",
+            title=_SUCCESS_TITLE,
             border_style="green",
             padding=(0, 1),
         ))
@@ -163,7 +257,7 @@ class RichFormatter:
                 )
                 
                 if title:
-                    self.console.print(Panel(
+                    self.console.print(self._panel(
                         syntax,
                         title=f"[bold]{title}[/bold]",
                         border_style="dim",
@@ -177,7 +271,7 @@ class RichFormatter:
         # Display as plain text
         content = f"```{language}\n{code}\n```"
         if title:
-            self.console.print(Panel(content, title=title))
+            self.console.print(self._panel(content, title=title))
         else:
             self.console.print(content)
     
@@ -214,31 +308,33 @@ class RichFormatter:
         
         table = Table(title=title)
         for col in columns:
-            table.add_column(col.replace("_", " ").title())
+            table.add_column(_pretty_col(col))
         
         for row in data:
             table.add_row(*[str(row.get(col, "")) for col in columns])
         
         self.console.print(table)
     
+    def _panel(self, content: Any, **kwargs) -> Any:
+        """Wrap content in a Panel, or return it bare when not on a terminal"""
+        if not self._is_tty:
+            return content
+        return Panel(content, **kwargs)
+    
+    def _is_plain_text(self, text: str) -> bool:
+        """Cheap check for short or single-line text with no markdown markers"""
+        if len(text) < 16:
+            return True
+        return "\n" not in text and not any(c in text for c in _MARKDOWN_MARKER_CHARS)
+    
     def _contains_markdown(self, text: str) -> bool:
         """Check if text contains markdown formatting"""
-        markdown_patterns = [
-            r'#{1,6}\s',  # Headers
-            r'\*\*.*?\*\*',  # Bold
-            r'\*.*?\*',  # Italic
-            r'`.*?`',  # Inline code
-            r'```.*?```',  # Code blocks
-            r'\[.*?\]\(.*?\)',  # Links
-            r'^\s*[-*+]\s',  # Lists
-            r'^\s*\d+\.\s',  # Numbered lists
-        ]
-        
-        for pattern in markdown_patterns:
-            if re.search(pattern, text, re.MULTILINE | re.DOTALL):
-                return True
+        if len(text) > _MARKDOWN_PROBE_HEAD + _MARKDOWN_PROBE_TAIL:
+            probe = text[:_MARKDOWN_PROBE_HEAD] + "\n" + text[-_MARKDOWN_PROBE_TAIL:]
+        else:
+            probe = text
         
-        return False
+        return _MARKDOWN_PATTERN.search(probe) is not None
     
     def _format_tool_result(self, tool_name: str, result: Dict[str, Any]) -> Any:
         """Format tool result based on tool type"""
@@ -311,15 +407,19 @@ class RichFormatter:
         table.add_column("Size", justify="right")
         table.add_column("Details", style="dim")
         
+        add_row = table.add_row
         for item in results[:20]:  # Limit display
-            details = ""
-            if item.get("type") == "content_match":
-                details = f"{item.get('total_matches', 0)} matches"
+            get = item.get
+            item_type = get("type", "")
+            if item_type == "content_match":
+                details = f"{get('total_matches', 0)} matches"
+            else:
+                details = ""
             
-            table.add_row(
-                item.get("type", "").replace("_", " ").title(),
-                item.get("path", ""),
-                item.get("size_formatted", ""),
+            add_row(
+                _pretty_col(item_type),
+                get("path", ""),
+                get("size_formatted", ""),
                 details
             )
         
@@ -5,33 +5,209 @@ Provides a rich interactive terminal interface for conversing with AI models.
 """
 
 import asyncio
-from typing import Optional, List, Dict, Any
+import functools
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
 import json
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
-from rich.prompt import Prompt, Confirm
+from rich.prompt import Confirm
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.syntax import Syntax
+from prompt_toolkit import PromptSession
+from prompt_toolkit.patch_stdout import patch_stdout
 import structlog
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 from ..core.config import Config
 from ..core.api import OpenRouterClient, Message
 from ..core.models import ModelManager
 from ..core.session import SessionManager
-from ..tools.base import ToolRegistry
+from ..tools.base import ToolRegistry, ToolResult
 from .formatting import RichFormatter
 
 logger = structlog.get_logger(__name__)
 
+# Read-only tools whose results can be reused for identical calls in a session
+CACHEABLE_TOOLS = frozenset({
+    "read_file",
+    "search_files",
+    "diff_files",
+    "analyze_code",
+    "check_syntax",
+    "git_status",
+    "system_info",
+    "check_dependencies",
+    "web_search",
+    "web_fetch",
+    "extract_code",
+    "search_and_analyze",
+})
+
+TOOL_CACHE_SIZE = 128
+
+# Streamed output is re-rendered after this many new characters or seconds
+STREAM_RENDER_CHARS = 40
+STREAM_RENDER_INTERVAL = 0.1
+
+# Minimum seconds between connection warm-up requests
+WARM_UP_INTERVAL = 30.0
+
+
+def _json_loads(data: str) -> Any:
+    """Parse JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any) -> str:
+    """Serialize JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            pass  # Non-string keys etc.; let the stdlib handle it
+    return json.dumps(data)
+
+
+SYSTEM_PROMPT_TEMPLATE = """You are 200Model8CLI, an advanced AI assistant with comprehensive tool-calling capabilities. You can:
+
+🔧 **Available Tools ({tool_count} total):**
+- **File Operations**: read_file, write_file, create_directory, list_directory, delete_file, copy_file, move_file
+- **Web Search**: web_search (search the internet for information)
+- **Browser Automation**: open_browser, search_browser (open URLs and search directly in browsers like Chrome, Firefox, Edge, Brave)
+- **Git Operations**: git_status, git_add, git_commit, git_push, git_pull, git_branch, git_log
+- **System Operations**: execute_command, get_system_info, list_processes
+- **Code Analysis**: analyze_code, run_code, format_code, lint_code
+
+🌐 **Browser Capabilities:**
+- I CAN open browsers and search for information
+- I CAN open specific URLs in different browsers (Chrome, Firefox, Edge, Brave)
+- I CAN perform web searches directly in browsers
+- I CAN search for current information like "top Netflix movies 2025"
+
+💡 **How to use me:**
+- Ask me to search for information: "search for Python tutorials"
+- Ask me to open websites: "open Google in Chrome"
+- Ask me to search in browser: "search for top Netflix movies 2025 in Brave"
+- Ask me about files: "what files are in this directory?"
+- Ask me to create/edit files: "create a Python hello world file"
+- Ask me to run commands: "check system information"
+
+I'm proactive and will use the appropriate tools to help you accomplish your tasks!"""
+
+HELP_PANEL = Panel("""
+[bold]Available Commands:[/bold]
+
+[cyan]/help[/cyan]           - Show this help message
+[cyan]/exit[/cyan]           - Exit the application
+[cyan]/model <name>[/cyan]   - Switch to a different model
+[cyan]/models[/cyan]         - List available models
+[cyan]/session <cmd>[/cyan]  - Session management (save, load, new)
+[cyan]/sessions[/cyan]       - List all sessions
+[cyan]/tools[/cyan]          - List available tools
+[cyan]/capabilities[/cyan]   - Show AI capabilities and examples
+[cyan]/clear[/cyan]          - Clear the screen
+[cyan]/config[/cyan]         - Show configuration
+
+[bold green]AI Capabilities:[/bold green]
+• Search the web and open browsers
+• Create, read, and edit files
+• Execute system commands
+• Manage Git repositories
+• Analyze and run code
+
+[bold]Usage:[/bold]
+- Type your message and press Enter to chat
+- Use Ctrl+C to interrupt, then confirm to exit
+- Messages are automatically saved to the current session
+        """.strip(), title="Help")
+
+CAPABILITIES_TEMPLATE = """
+[bold blue]🤖 200Model8CLI AI Capabilities[/bold blue]
+
+[bold green]🔧 Available Tools ({tool_count} total):[/bold green]
+
+[yellow]🌐 Web & Browser:[/yellow]
+• web_search - Search the internet for information
+• open_browser - Open URLs in browsers (Chrome, Firefox, Edge, Brave)
+• search_browser - Search directly in browsers
+
+[yellow]📁 File Operations:[/yellow]
+• read_file, write_file, create_directory, list_directory
+• delete_file, copy_file, move_file
+
+[yellow]⚙️ System Operations:[/yellow]
+• execute_command - Run terminal commands
+• get_system_info - Get system information
+• list_processes - List running processes
+
+[yellow]🔧 Git Operations:[/yellow]
+• git_status, git_add, git_commit, git_push, git_pull
+• git_branch, git_log
+
+[yellow]💻 Code Analysis:[/yellow]
+• analyze_code, run_code, format_code, lint_code
+
+[bold cyan]💡 Example Commands:[/bold cyan]
+• "search for top Netflix movies 2025"
+• "open Brave and search for Python tutorials"
+• "what files are in this directory?"
+• "create a Python hello world file"
+• "check system information"
+• "run git status"
+
+[bold red]🚀 I'm proactive and will use tools automatically to help you![/bold red]
+        """
+
 
 class InteractiveMode:
     """
     Interactive terminal interface for 200Model8CLI
     """
     
+    __slots__ = (
+        "config",
+        "api_client",
+        "model_manager",
+        "session_manager",
+        "tool_registry",
+        "console",
+        "formatter",
+        "running",
+        "current_session",
+        "recent_messages",
+        "max_recent_messages",
+        "loop_threshold",
+        "_pt_session",
+        "_prefetch_task",
+        "_last_warm_up",
+        "_pending_msgs",
+        "_save_lock",
+        "_tool_defs_cache",
+        "_tool_defs_key",
+        "_tools_by_category",
+        "_tools_by_category_key",
+        "_system_prompt",
+        "_system_prompt_key",
+        "_capabilities_panel",
+        "_capabilities_panel_key",
+        "_model_line_cache",
+        "_tool_cache",
+    )
+    
     def __init__(
         self,
         config: Config,
@@ -48,35 +224,65 @@ class InteractiveMode:
         
         self.console = Console()
         self.formatter = RichFormatter(config)
+        self._pt_session = PromptSession()
+        self._prefetch_task: Optional[asyncio.Task] = None
+        self._last_warm_up: Optional[float] = None
 
         self.running = True
         self.current_session = None
+        
+        # Session messages produced during a turn, flushed once at its end
+        self._pending_msgs: List[Tuple[str, str, Dict[str, Any]]] = []
+        # Created on the running loop; asyncio.Lock binds to a loop on 3.8/3.9
+        self._save_lock: Optional[asyncio.Lock] = None
+        
+        # Data derived from the tool registry, rebuilt when its version changes
+        self._tool_defs_cache: Optional[List[Dict[str, Any]]] = None
+        self._tool_defs_key: Optional[int] = None
+        self._tools_by_category: Optional[Dict[str, List[Any]]] = None
+        self._tools_by_category_key: Optional[int] = None
+        
+        # Tool-count dependent text, rebuilt when the registry version changes
+        self._system_prompt: Optional[str] = None
+        self._system_prompt_key: Optional[int] = None
+        self._capabilities_panel: Optional[Panel] = None
+        self._capabilities_panel_key: Optional[int] = None
+        
+        # Rendered /models entries keyed by model id
+        self._model_line_cache: Dict[str, Tuple[Any, str]] = {}
+        
+        # Results of read-only tool calls keyed by (tool_name, canonical arguments)
+        self._tool_cache: "OrderedDict[Tuple[str, str], ToolResult]" = OrderedDict()
 
-        # Loop detection
-        self.recent_messages = []
+        # Loop detection: (normalized message, its word set) pairs
+        self.recent_messages: List[Tuple[str, frozenset]] = []
         self.max_recent_messages = 5
         self.loop_threshold = 3
         
     async def start(self):
         """Start interactive mode"""
         self.console.print("[dim]Type 'help' for commands, 'exit' to quit[/dim]")
+        self._save_lock = asyncio.Lock()
         
         # Create or load session
         await self._setup_session()
         
         while self.running:
             try:
-                # Get user input
-                user_input = Prompt.ask(
-                    f"[bold blue]200model8CLI[/bold blue]",
-                    default=""
-                )
+                # Warm up the next request while the user is typing
+                if self._prefetch_task is None or self._prefetch_task.done():
+                    self._prefetch_task = asyncio.create_task(self._prefetch())
+                
+                # Get user input without blocking the event loop
+                with patch_stdout():
+                    user_input = await self._pt_session.prompt_async("200model8CLI> ")
                 
                 if not user_input.strip():
                     continue
                 
                 # Handle commands
                 if user_input.startswith('/'):
+                    self._cancel_prefetch()
                     await self._handle_command(user_input[1:])
                     continue
                 
@@ -84,7 +290,7 @@ class InteractiveMode:
                 await self._process_user_message(user_input)
                 
             except KeyboardInterrupt:
-                if Confirm.ask("\n[yellow]Exit 200Model8CLI?[/yellow]"):
+                if await self._run_blocking(Confirm.ask, "\n[yellow]Exit 200Model8CLI?[/yellow]"):
                     break
             except EOFError:
                 break
@@ -92,8 +298,40 @@ class InteractiveMode:
                 self.console.print(f"[red]Error: {e}[/red]")
                 logger.error("Interactive mode error", error=str(e))
         
+        self._cancel_prefetch()
         self.console.print("[dim]Session saved. Goodbye![/dim]")
     
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking call in the default executor (asyncio.to_thread needs 3.9)"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(func, *args, **kwargs)
+        )
+    
+    async def _prefetch(self):
+        """Prepare tool definitions and the API connection for the next message"""
+        # Runs as a fire-and-forget task, so failures are logged here rather than lost
+        try:
+            model = self.config.models.default
+            self._get_tool_definitions(model)
+            
+            if not (model and self.api_client.is_openrouter_model(model)):
+                return
+            
+            # A pooled connection stays open between prompts; don't probe it every time
+            now = time.monotonic()
+            if self._last_warm_up is not None and now - self._last_warm_up < WARM_UP_INTERVAL:
+                return
+            self._last_warm_up = now
+            await self.api_client.warm_up()
+        except Exception as e:
+            logger.debug("Prefetch failed", error=str(e))
+    
+    def _cancel_prefetch(self):
+        """Cancel a pending prefetch, e.g. when the input was a command"""
+        if self._prefetch_task is not None and not self._prefetch_task.done():
+            self._prefetch_task.cancel()
+        self._prefetch_task = None
+    
     async def _setup_session(self):
         """Setup or create a session"""
         # For now, create a new session
@@ -104,37 +342,22 @@ class InteractiveMode:
         )
 
         # Add system message to make the assistant aware of its capabilities
-        available_tools = list(self.tool_registry.tools.keys())
-        system_prompt = f"""You are 200Model8CLI, an advanced AI assistant with comprehensive tool-calling capabilities. You can:
-
-🔧 **Available Tools ({len(available_tools)} total):**
-- **File Operations**: read_file, write_file, create_directory, list_directory, delete_file, copy_file, move_file
-- **Web Search**: web_search (search the internet for information)
-- **Browser Automation**: open_browser, search_browser (open URLs and search directly in browsers like Chrome, Firefox, Edge, Brave)
-- **Git Operations**: git_status, git_add, git_commit, git_push, git_pull, git_branch, git_log
-- **System Operations**: execute_command, get_system_info, list_processes
-- **Code Analysis**: analyze_code, run_code, format_code, lint_code
-
-🌐 **Browser Capabilities:**
-- I CAN open browsers and search for information
-- I CAN open specific URLs in different browsers (Chrome, Firefox, Edge, Brave)
-- I CAN perform web searches directly in browsers
-- I CAN search for current information like "top Netflix movies 2025"
-
-💡 **How to use me:**
-- Ask me to search for information: "search for Python tutorials"
-- Ask me to open websites: "open Google in Chrome"
-- Ask me to search in browser: "search for top Netflix movies 2025 in Brave"
-- Ask me about files: "what files are in this directory?"
-- Ask me to create/edit files: "create a Python hello world file"
-- Ask me to run commands: "check system information"
-
-I'm proactive and will use the appropriate tools to help you accomplish your tasks!"""
+        system_prompt = self._get_system_prompt()
 
         self.session_manager.add_message("system", system_prompt)
 
         self.console.print(f"[dim]Started new session: {self.current_session.metadata.name}[/dim]")
     
+    def _get_system_prompt(self) -> str:
+        """Get the system prompt, cached until the tool registry changes"""
+        key = self.tool_registry.version
+        if self._system_prompt is None or self._system_prompt_key != key:
+            self._system_prompt = SYSTEM_PROMPT_TEMPLATE.format(
+                tool_count=len(self.tool_registry.tools)
+            )
+            self._system_prompt_key = key
+        return self._system_prompt
+    
     async def _handle_command(self, command: str):
         """Handle slash commands"""
         parts = command.split()
@@ -159,6 +382,7 @@ I'm proactive and will use the appropriate tools to help you accomplish your tas
             self._show_capabilities()
         elif cmd == "clear":
             self.console.clear()
+            self._tool_cache.clear()
         elif cmd == "config":
             self._show_config()
         else:
@@ -167,74 +391,22 @@ I'm proactive and will use the appropriate tools to help you accomplish your tas
     
     def _show_help(self):
         """Show help information"""
-        help_text = """
-[bold]Available Commands:[/bold]
-
-[cyan]/help[/cyan]           - Show this help message
-[cyan]/exit[/cyan]           - Exit the application
-[cyan]/model <name>[/cyan]   - Switch to a different model
-[cyan]/models[/cyan]         - List available models
-[cyan]/session <cmd>[/cyan]  - Session management (save, load, new)
-[cyan]/sessions[/cyan]       - List all sessions
-[cyan]/tools[/cyan]          - List available tools
-[cyan]/capabilities[/cyan]   - Show AI capabilities and examples
-[cyan]/clear[/cyan]          - Clear the screen
-[cyan]/config[/cyan]         - Show configuration
-
-[bold green]AI Capabilities:[/bold green]
-• Search the web and open browsers
-• Create, read, and edit files
-• Execute system commands
-• Manage Git repositories
-• Analyze and run code
-
-[bold]Usage:[/bold]
-- Type your message and press Enter to chat
-- Use Ctrl+C to interrupt, then confirm to exit
-- Messages are automatically saved to the current session
-        """
-        self.console.print(Panel(help_text.strip(), title="Help"))
+        self.console.print(HELP_PANEL)
 
     def _show_capabilities(self):
         """Show AI capabilities with examples"""
-        available_tools = list(self.tool_registry.tools.keys())
-        capabilities_text = f"""
-[bold blue]🤖 200Model8CLI AI Capabilities[/bold blue]
-
-[bold green]🔧 Available Tools ({len(available_tools)} total):[/bold green]
-
-[yellow]🌐 Web & Browser:[/yellow]
-• web_search - Search the internet for information
-• open_browser - Open URLs in browsers (Chrome, Firefox, Edge, Brave)
-• search_browser - Search directly in browsers
-
-[yellow]📁 File Operations:[/yellow]
-• read_file, write_file, create_directory, list_directory
-• delete_file, copy_file, move_file
-
-[yellow]⚙️ System Operations:[/yellow]
-• execute_command - Run terminal commands
-• get_system_info - Get system information
-• list_processes - List running processes
-
-[yellow]🔧 Git Operations:[/yellow]
-• git_status, git_add, git_commit, git_push, git_pull
-• git_branch, git_log
-
-[yellow]💻 Code Analysis:[/yellow]
-• analyze_code, run_code, format_code, lint_code
-
-[bold cyan]💡 Example Commands:[/bold cyan]
-• "search for top Netflix movies 2025"
-• "open Brave and search for Python tutorials"
-• "what files are in this directory?"
-• "create a Python hello world file"
-• "check system information"
-• "run git status"
-
-[bold red]🚀 I'm proactive and will use tools automatically to help you![/bold red]
-        """
-        self.console.print(Panel(capabilities_text.strip(), title="AI Capabilities"))
+        self.console.print(self._get_capabilities_panel())
+
+    def _get_capabilities_panel(self) -> Panel:
+        """Get the capabilities panel, cached until the tool registry changes"""
+        key = self.tool_registry.version
+        if self._capabilities_panel is None or self._capabilities_panel_key != key:
+            capabilities_text = CAPABILITIES_TEMPLATE.format(
+                tool_count=len(self.tool_registry.tools)
+            )
+            self._capabilities_panel = Panel(capabilities_text.strip(), title="AI Capabilities")
+            self._capabilities_panel_key = key
+        return self._capabilities_panel
 
     async def _handle_model_command(self, args: List[str]):
         """Handle model switching"""
@@ -249,7 +421,7 @@ I'm proactive and will use the appropriate tools to help you accomplish your tas
             # Update session model
             if self.current_session:
                 self.current_session.metadata.model = model_id
-                self.session_manager.save_current_session()
+                await self._save_session()
         else:
             self.console.print(f"[red]Model not found: {model_id}[/red]")
             await self._list_models()
@@ -263,14 +435,25 @@ I'm proactive and will use the appropriate tools to help you accomplish your tas
             return
         
         self.console.print("[bold]Available Models:[/bold]")
+        current_model = self.model_manager.current_model
         for model in models:
-            current = "→ " if model.info.id == self.model_manager.current_model else "  "
-            capabilities = ", ".join([cap.value for cap in list(model.capabilities)[:3]])
-            
-            self.console.print(
-                f"{current}[green]{model.info.id}[/green] - {model.info.name}"
-            )
-            self.console.print(f"    [dim]{capabilities}[/dim]")
+            current = "→ " if model.info.id == current_model else "  "
+            self.console.print(f"{current}{self._get_model_line(model)}")
+    
+    def _get_model_line(self, model: Any) -> str:
+        """Get the rendered /models entry for a model profile"""
+        cached = self._model_line_cache.get(model.info.id)
+        # Profiles are rebuilt when the model list refreshes, so match by identity
+        if cached is not None and cached[0] is model:
+            return cached[1]
+        
+        capabilities = ", ".join([cap.value for cap in list(model.capabilities)[:3]])
+        line = (
+            f"[green]{model.info.id}[/green] - {model.info.name}\n"
+            f"    [dim]{capabilities}[/dim]"
+        )
+        self._model_line_cache[model.info.id] = (model, line)
+        return line
     
     async def _handle_session_command(self, args: List[str]):
         """Handle session management"""
@@ -289,11 +472,12 @@ I'm proactive and will use the appropriate tools to help you accomplish your tas
                 name=name,
                 model=self.model_manager.current_model
             )
+            self._tool_cache.clear()
             self.console.print(f"[green]✓[/green] Created new session: {self.current_session.metadata.name}")
         
         elif cmd == "save":
             if self.current_session:
-                self.session_manager.save_current_session()
+                await self._save_session()
                 self.console.print("[green]✓[/green] Session saved")
             else:
                 self.console.print("[yellow]No active session to save[/yellow]")
@@ -304,10 +488,11 @@ I'm proactive and will use the appropriate tools to help you accomplish your tas
                 return
             
             session_id = args[1]
-            session = self.session_manager.load_session(session_id)
+            session = await self._run_blocking(self.session_manager.load_session, session_id)
             if session:
                 self.current_session = session
                 self.model_manager.set_current_model(session.metadata.model)
+                self._tool_cache.clear()
                 self.console.print(f"[green]✓[/green] Loaded session: {session.metadata.name}")
             else:
                 self.console.print(f"[red]Session not found: {session_id}[/red]")
@@ -318,24 +503,27 @@ I'm proactive and will use the appropriate tools to help you accomplish your tas
     
     async def _list_sessions(self):
         """List all sessions"""
-        sessions = self.session_manager.list_sessions()
+        sessions = await self._run_blocking(self.session_manager.list_sessions)
         
         if not sessions:
             self.console.print("[yellow]No sessions found[/yellow]")
             return
         
-        self.console.print("[bold]Available Sessions:[/bold]")
+        from datetime import datetime
+        
+        # Build one renderable so the listing is written in a single pass
+        listing = Text("Available Sessions:", style="bold")
+        current_id = self.current_session.metadata.id if self.current_session else None
         for session in sessions[:10]:  # Show last 10 sessions
-            current = "→ " if (self.current_session and 
-                             session.id == self.current_session.metadata.id) else "  "
-            
-            from datetime import datetime
+            current = "→ " if session.id == current_id else "  "
             updated = datetime.fromtimestamp(session.updated_at).strftime("%m/%d %H:%M")
             
-            self.console.print(
-                f"{current}[green]{session.id[:8]}[/green] - {session.name} "
-                f"[dim]({session.total_messages} msgs, {updated})[/dim]"
-            )
+            listing.append("\n" + current)
+            listing.append(session.id[:8], style="green")
+            listing.append(f" - {session.name} ")
+            listing.append(f"({session.total_messages} msgs, {updated})", style="dim")
+        
+        self.console.print(listing)
     
     def _list_tools(self):
         """List available tools"""
@@ -345,23 +533,32 @@ I'm proactive and will use the appropriate tools to help you accomplish your tas
             self.console.print("[yellow]No tools available[/yellow]")
             return
         
-        self.console.print("[bold]Available Tools:[/bold]")
-        
         # Group by category
-        by_category = {}
-        for tool in tools:
-            category = tool.category.value
-            if category not in by_category:
-                by_category[category] = []
-            by_category[category].append(tool)
-        
-        for category, category_tools in by_category.items():
-            self.console.print(f"\n[cyan]{category.replace('_', ' ').title()}:[/cyan]")
+        key = self.tool_registry.version
+        if self._tools_by_category is None or self._tools_by_category_key != key:
+            by_category = {}
+            for tool in tools:
+                category = tool.category.value
+                if category not in by_category:
+                    by_category[category] = []
+                by_category[category].append(tool)
+            self._tools_by_category = by_category
+            self._tools_by_category_key = key
+        
+        # Build one renderable so the listing is written in a single pass
+        listing = Text("Available Tools:", style="bold")
+        for category, category_tools in self._tools_by_category.items():
+            listing.append(f"\n\n{category.replace('_', ' ').title()}:", style="cyan")
             for tool in category_tools:
-                dangerous = " [red]⚠[/red]" if tool.dangerous else ""
-                confirmation = " [yellow]?[/yellow]" if tool.requires_confirmation else ""
-                
-                self.console.print(f"  • [green]{tool.name}[/green]{dangerous}{confirmation} - {tool.description}")
+                listing.append("\n  • ")
+                listing.append(tool.name, style="green")
+                if tool.dangerous:
+                    listing.append(" ⚠", style="red")
+                if tool.requires_confirmation:
+                    listing.append(" ?", style="yellow")
+                listing.append(f" - {tool.description}")
+        
+        self.console.print(listing)
     
     def _show_config(self):
         """Show current configuration"""
@@ -383,28 +580,26 @@ I'm proactive and will use the appropriate tools to help you accomplish your tas
         """Process user message and get AI response"""
         try:
             # Check for loops
-            if self._detect_loop(user_input):
+            normalized = user_input.lower().strip()
+            if self._detect_loop(normalized):
                 self.console.print("[yellow]⚠️ Loop detected! Trying a different approach...[/yellow]")
                 user_input = f"Let me try a different approach: {user_input}"
+                normalized = user_input.lower().strip()
 
             # Add to recent messages for loop detection
-            self.recent_messages.append(user_input.lower().strip())
+            self.recent_messages.append((normalized, frozenset(normalized.split())))
             if len(self.recent_messages) > self.max_recent_messages:
                 self.recent_messages.pop(0)
 
-            # Add user message to session
-            self.session_manager.add_message("user", user_input)
+            # Add user message to session; it is persisted with the rest of the turn
+            self.session_manager.add_message("user", user_input, autosave=False)
             
             # Get context messages
             context_messages = self.session_manager.get_context_messages()
             
             # Get tool definitions (disable for Ollama models)
             current_model = self.config.models.default
-            if current_model and current_model.startswith("ollama/"):
-                # Disable tools for Ollama models as they don't support tool calling well
-                tool_definitions = []
-            else:
-                tool_definitions = self.tool_registry.get_tool_definitions()
+            tool_definitions = self._get_tool_definitions(current_model)
             
             # Show thinking indicator
             with Progress(
@@ -416,145 +611,294 @@ I'm proactive and will use the appropriate tools to help you accomplish your tas
                 task = progress.add_task("Thinking...", total=None)
                 
                 # Make API call
-                if self.config.ui.streaming:
-                    await self._handle_streaming_response(
-                        context_messages, tool_definitions, progress, task
-                    )
-                else:
-                    await self._handle_non_streaming_response(
-                        context_messages, tool_definitions, progress, task
-                    )
+                await self._handle_response(
+                    context_messages,
+                    tool_definitions,
+                    progress,
+                    task,
+                    stream=self.config.ui.streaming,
+                )
         
         except Exception as e:
             self.console.print(f"[red]Failed to process message: {e}[/red]")
             logger.error("Message processing failed", error=str(e))
+        
+        finally:
+            await self._flush_pending_messages()
+    
+    async def _flush_pending_messages(self):
+        """Write the messages buffered during a turn with a single session save"""
+        pending = list(self._pending_msgs)
+        self._pending_msgs.clear()
+        async with self._get_save_lock():
+            await self._run_blocking(self.session_manager.add_messages_batch, pending)
+    
+    async def _save_session(self):
+        """Save the current session without blocking the event loop"""
+        async with self._get_save_lock():
+            await self._run_blocking(self.session_manager.save_current_session)
+    
+    def _get_save_lock(self) -> asyncio.Lock:
+        """Lock serializing session saves, created on the running loop"""
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        return self._save_lock
+
+    def _get_tool_definitions(self, model: Optional[str]) -> List[Dict[str, Any]]:
+        """Get tool definitions, cached until the tool registry changes"""
+        if model and model.startswith("ollama/"):
+            # Disable tools for Ollama models as they don't support tool calling well
+            return []
+        
+        key = self.tool_registry.version
+        if self._tool_defs_cache is None or self._tool_defs_key != key:
+            self._tool_defs_cache = self.tool_registry.get_tool_definitions()
+            self._tool_defs_key = key
+        return self._tool_defs_cache
 
-    def _detect_loop(self, message: str) -> bool:
+    def _detect_loop(self, normalized_message: str) -> bool:
         """Detect if user is repeating similar messages (indicating a loop)"""
         if len(self.recent_messages) < self.loop_threshold:
             return False
 
-        normalized_message = message.lower().strip()
+        words = normalized_message.split()
+        message_tokens = frozenset(words)
+        overlap_needed = len(words) * 0.6
+        needed = self.loop_threshold - 1
 
         # Count similar messages in recent history
         similar_count = 0
-        for recent_msg in self.recent_messages[-self.loop_threshold:]:
+        for recent_msg, recent_tokens in self.recent_messages[-self.loop_threshold:]:
             # Simple similarity check - could be improved with fuzzy matching
             if (normalized_message in recent_msg or
                 recent_msg in normalized_message or
-                len(set(normalized_message.split()) & set(recent_msg.split())) > len(normalized_message.split()) * 0.6):
+                len(message_tokens & recent_tokens) > overlap_needed):
                 similar_count += 1
+                if similar_count >= needed:
+                    return True
 
-        return similar_count >= self.loop_threshold - 1
+        return similar_count >= needed
     
-    async def _handle_streaming_response(
+    async def _handle_response(
         self,
         messages: List[Message],
         tools: List[Dict[str, Any]],
         progress: Progress,
-        task_id: Any
+        task_id: Any,
+        stream: bool = False,
     ):
-        """Handle streaming response"""
+        """Get a response from the API and display it"""
         try:
-            # For now, fall back to non-streaming to avoid async issues
-            progress.update(task_id, description="Getting response...")
+            model = self.config.models.default
+            if stream and model and self.api_client.is_openrouter_model(model):
+                await self._handle_stream(messages, tools, progress)
+                return
+            
+            if stream:
+                # Ollama and Groq replies are not streamed yet
+                progress.update(task_id, description="Getting response...")
 
             response = await self.api_client.chat_completion(
                 messages=messages,
                 tools=tools if tools else None,
-                stream=False  # Disable streaming for stability
+                stream=False
             )
 
             progress.stop()
 
-            # Handle response
-            if response.choices and len(response.choices) > 0:
-                choice = response.choices[0]
-                message = choice.get("message", {}) if isinstance(choice, dict) else choice
+            if response.choices:
+                message = self._normalize_message(response.choices[0])
 
                 # Handle content
-                if isinstance(message, dict) and message.get("content"):
-                    response_text = message["content"]
-                    self.formatter.display_assistant_message(response_text)
-                    self.session_manager.add_message("assistant", response_text)
+                if message["content"]:
+                    self.formatter.display_assistant_message(message["content"])
+                    self._pending_msgs.append(("assistant", message["content"], {}))
 
-                # Handle tool calls if any
-                if isinstance(message, dict) and message.get("tool_calls"):
+                # Handle tool calls
+                if message["tool_calls"]:
                     await self._handle_tool_calls(message["tool_calls"])
         
         except Exception as e:
             progress.stop()
             raise e
     
-    async def _handle_non_streaming_response(
-        self, 
-        messages: List[Message], 
+    async def _handle_stream(
+        self,
+        messages: List[Message],
         tools: List[Dict[str, Any]],
         progress: Progress,
-        task_id: Any
     ):
-        """Handle non-streaming response"""
+        """Render a streamed response as it arrives, then dispatch its tool calls"""
+        chunks = await self.api_client.chat_completion(
+            messages=messages,
+            tools=tools if tools else None,
+            stream=True
+        )
+        
+        content_parts: List[str] = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        unrendered = ""
+        last_render = time.monotonic()
+        live: Optional[Live] = None
+        
+        self.formatter.begin_stream()
         try:
-            response = await self.api_client.chat_completion(
-                messages=messages,
-                tools=tools if tools else None,
-                stream=False
-            )
+            async for chunk in chunks:
+                choices = chunk.get("choices") or []
+                if not choices:
+                    continue
+                
+                delta = choices[0].get("delta") or {}
+                
+                text = delta.get("content")
+                if text:
+                    if live is None:
+                        # Swap the spinner for the live response on the first token
+                        progress.stop()
+                        live = Live(console=self.console, refresh_per_second=10)
+                        live.start()
+                    
+                    content_parts.append(text)
+                    unrendered += text
+                    now = time.monotonic()
+                    # Batch re-renders instead of redrawing on every token
+                    if (len(unrendered) > STREAM_RENDER_CHARS
+                            or now - last_render >= STREAM_RENDER_INTERVAL):
+                        live.update(self.formatter.feed_stream(unrendered))
+                        unrendered = ""
+                        last_render = now
+                
+                # Tool call deltas arrive in pieces; assemble them by index
+                for call_delta in delta.get("tool_calls") or []:
+                    call = tool_calls.setdefault(call_delta.get("index", 0), {
+                        "id": None,
+                        "type": "function",
+                        "function": {"name": "", "arguments": ""},
+                    })
+                    if call_delta.get("id"):
+                        call["id"] = call_delta["id"]
+                    function = call_delta.get("function") or {}
+                    call["function"]["name"] += function.get("name") or ""
+                    call["function"]["arguments"] += function.get("arguments") or ""
             
+            if live is not None:
+                live.update(self.formatter.feed_stream(unrendered))
+        finally:
             progress.stop()
-            
-            if response.choices and len(response.choices) > 0:
-                choice = response.choices[0]
-                message = choice.get("message", {}) if isinstance(choice, dict) else choice
-
-                # Handle content
-                if isinstance(message, dict) and message.get("content"):
-                    content = message["content"]
-                    self.formatter.display_assistant_message(content)
-                    self.session_manager.add_message("assistant", content)
-
-                # Handle tool calls
-                if isinstance(message, dict) and message.get("tool_calls"):
-                    await self._handle_tool_calls(message["tool_calls"])
+            if live is not None:
+                live.stop()
+            self.formatter.end_stream()
         
-        except Exception as e:
-            progress.stop()
-            raise e
+        if content_parts:
+            self._pending_msgs.append(("assistant", "".join(content_parts), {}))
+        
+        if tool_calls:
+            await self._handle_tool_calls([tool_calls[i] for i in sorted(tool_calls)])
+    
+    def _normalize_message(self, choice: Any) -> Dict[str, Any]:
+        """Extract content and tool calls from a response choice"""
+        message = choice.get("message") if isinstance(choice, dict) else None
+        if not isinstance(message, dict):
+            return {"content": None, "tool_calls": None}
+        
+        return {
+            "content": message.get("content"),
+            "tool_calls": message.get("tool_calls"),
+        }
     
     async def _handle_tool_calls(self, tool_calls: List[Dict[str, Any]]):
         """Handle tool calls from AI"""
+        # Resolve and confirm calls one at a time so prompts stay in order
+        approved = []
         for tool_call in tool_calls:
+            # Validate the call's shape up front instead of catching KeyError
+            function = tool_call.get("function") or {}
+            tool_name = function.get("name")
+            if not tool_name:
+                logger.warning("Skipping tool call without a name", tool_call_id=tool_call.get("id"))
+                continue
+            
             try:
-                function = tool_call["function"]
-                tool_name = function["name"]
-                arguments = json.loads(function["arguments"])
-                
-                self.console.print(f"[dim]🔧 Calling tool: {tool_name}[/dim]")
-                
-                # Check if tool requires confirmation
-                tool = self.tool_registry.get_tool(tool_name)
-                if tool and tool.requires_confirmation:
-                    if not Confirm.ask(f"[yellow]Execute {tool_name}?[/yellow]"):
-                        self.console.print("[dim]Tool execution cancelled[/dim]")
-                        continue
-                
-                # Execute tool
-                result = await self.tool_registry.execute_tool(tool_name, **arguments)
-                
-                if result.success:
-                    self.console.print(f"[green]✓[/green] Tool executed successfully")
-                    if result.result:
-                        self.formatter.display_tool_result(tool_name, result.result)
-                else:
-                    self.console.print(f"[red]✗[/red] Tool failed: {result.error}")
-                
-                # Add tool result to session
-                self.session_manager.add_message(
-                    "tool",
-                    json.dumps(result.result if result.success else {"error": result.error}),
-                    tool_call_id=tool_call["id"]
-                )
-                
-            except Exception as e:
-                self.console.print(f"[red]Tool execution error: {e}[/red]")
-                logger.error("Tool execution failed", tool=tool_name, error=str(e))
+                arguments = _json_loads(function.get("arguments") or "{}")
+            except ValueError as e:
+                # One malformed call must not stop the rest of the batch
+                self.console.print(f"[red]Invalid tool call: {e}[/red]")
+                logger.error("Invalid tool call", tool=tool_name, error=str(e))
+                continue
+            
+            self.console.print(f"[dim]🔧 Calling tool: {tool_name}[/dim]")
+            
+            # Check if tool requires confirmation
+            tool = self.tool_registry.get_tool(tool_name)
+            if tool and tool.requires_confirmation:
+                if not await self._run_blocking(Confirm.ask, f"[yellow]Execute {tool_name}?[/yellow]"):
+                    self.console.print("[dim]Tool execution cancelled[/dim]")
+                    continue
+            
+            approved.append((tool_call.get("id"), tool, tool_name, arguments))
+        
+        if not approved:
+            return
+        
+        # Read-only calls are independent and run concurrently; anything that
+        # may change state runs in the order the model asked for
+        if all(name in CACHEABLE_TOOLS for _, _, name, _ in approved):
+            results = await asyncio.gather(
+                *(self._execute_tool_cached(tool, name, args) for _, tool, name, args in approved),
+                return_exceptions=True,
+            )
+        else:
+            results = []
+            for _, tool, name, args in approved:
+                try:
+                    results.append(await self._execute_tool_cached(tool, name, args))
+                except Exception as e:
+                    results.append(e)
+        
+        for (tool_call_id, _, tool_name, _), result in zip(approved, results):
+            if isinstance(result, BaseException):
+                self.console.print(f"[red]Tool execution error: {result}[/red]")
+                logger.error("Tool execution failed", tool=tool_name, error=str(result))
+                continue
+            
+            if result.success:
+                self.console.print(f"[green]✓[/green] Tool executed successfully")
+                if result.result:
+                    self.formatter.display_tool_result(tool_name, result.result)
+            else:
+                self.console.print(f"[red]✗[/red] Tool failed: {result.error}")
+            
+            # Add tool result to session
+            self._pending_msgs.append((
+                "tool",
+                _json_dumps(result.result if result.success else {"error": result.error}),
+                {"tool_call_id": tool_call_id},
+            ))
+    
+    async def _execute_tool_cached(
+        self, tool: Any, tool_name: str, arguments: Dict[str, Any]
+    ) -> ToolResult:
+        """Execute a tool, reusing results of identical read-only calls"""
+        cacheable = (
+            tool is not None
+            and tool_name in CACHEABLE_TOOLS
+            and not tool.dangerous
+        )
+        if not cacheable:
+            # Anything else may change state that cached results depend on
+            self._tool_cache.clear()
+            return await self.tool_registry.execute_tool(tool_name, **arguments)
+        
+        key = (tool_name, json.dumps(arguments, sort_keys=True, default=str))
+        cached = self._tool_cache.get(key)
+        if cached is not None:
+            self._tool_cache.move_to_end(key)
+            logger.debug("Tool result served from cache", tool=tool_name)
+            return cached
+        
+        result = await self.tool_registry.execute_tool(tool_name, **arguments)
+        if result.success:
+            self._tool_cache[key] = result
+            if len(self._tool_cache) > TOOL_CACHE_SIZE:
+                self._tool_cache.popitem(last=False)
+        return result
@@ -5,159 +5,398 @@ Provides guided learning experiences and explanations.
 """
 
 import asyncio
-from typing import Dict, List, Optional, Any
-from rich.console import Console
+import hashlib
+import json
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property, lru_cache, partial
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Mapping, Tuple
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
 from rich.text import Text
 from rich.markdown import Markdown
+from rich.live import Live
 
-import structlog
+import httpx
 
 from ..core.config import Config
-from ..core.api import OpenRouterClient
+from ..core.api import OpenRouterClient, Message, RateLimitError
 from ..core.models import ModelManager
-from ..tools.knowledge_tools import KnowledgeDatabase, KnowledgeEntry
+from ..tools.knowledge_tools import KnowledgeDatabase, KnowledgeEntry, parse_tags
 from ..tools.base import ToolRegistry
+from ..utils.logging import get_logger
 
-logger = structlog.get_logger(__name__)
+logger = get_logger(__name__)
 console = Console()
 
+# Minimum seconds between re-renders of a streamed lesson
+LESSON_RENDER_INTERVAL = 0.125
+
+# Attempts and maximum backoff (seconds) for lesson generation requests
+LESSON_MAX_ATTEMPTS = 3
+LESSON_MAX_BACKOFF = 8.0
+
+# In-memory caches in front of the knowledge database; search results
+# expire quickly because entries can be added while learning mode runs
+LESSON_MEMORY_CACHE_SIZE = 64
+SEARCH_MEMORY_CACHE_SIZE = 64
+SEARCH_MEMORY_CACHE_TTL = 60.0
+
+LESSON_PROMPT_TEMPLATE = """
+Create a comprehensive lesson about "{lesson_title}" for 200Model8CLI users.
+
+The lesson should include:
+1. Clear explanation of the concept
+2. Step-by-step instructions
+3. Common use cases
+4. Best practices
+5. Tips and tricks
+
+Keep it practical and focused on 200Model8CLI features.
+Format the response in markdown.
+"""
+
+LESSON_BATCH_PROMPT_TEMPLATE = """
+Create a comprehensive lesson for 200Model8CLI users on each of these topics:
+{lesson_list}
+
+Each lesson should include:
+1. Clear explanation of the concept
+2. Step-by-step instructions
+3. Common use cases
+4. Best practices
+5. Tips and tricks
+
+Keep them practical and focused on 200Model8CLI features.
+Respond with only a JSON object of the form
+{{"lessons": [{{"title": "<lesson title>", "markdown": "<lesson in markdown>"}}]}}
+using the lesson titles exactly as given.
+"""
+
+
+_TOPICS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    "cli_basics": MappingProxyType({
+        "title": "CLI Basics",
+        "description": "Learn the fundamentals of using 200Model8CLI",
+        "lessons": (
+            "Getting started with interactive mode",
+            "Using file operations",
+            "Working with models",
+            "Understanding tool calling",
+        )
+    }),
+    "git_workflow": MappingProxyType({
+        "title": "Git Workflow",
+        "description": "Master Git operations with AI assistance",
+        "lessons": (
+            "Basic Git commands",
+            "AI-generated commit messages",
+            "Branch management",
+            "GitHub integration",
+        )
+    }),
+    "web_automation": MappingProxyType({
+        "title": "Web Automation",
+        "description": "Learn web search and browser automation",
+        "lessons": (
+            "Web search techniques",
+            "Browser automation",
+            "Content extraction",
+            "Research workflows",
+        )
+    }),
+    "code_analysis": MappingProxyType({
+        "title": "Code Analysis",
+        "description": "Understand code analysis and improvement",
+        "lessons": (
+            "Code review with AI",
+            "Automated testing",
+            "Code formatting",
+            "Performance optimization",
+        )
+    }),
+    "advanced_features": MappingProxyType({
+        "title": "Advanced Features",
+        "description": "Explore advanced 200Model8CLI capabilities",
+        "lessons": (
+            "Session management",
+            "Custom workflows",
+            "Agent mode",
+            "Knowledge management",
+        )
+    })
+})
+
+_EXAMPLES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "cli_basics": MappingProxyType({
+        "Getting started with interactive mode": "200model8cli\n# Then try: ask 'What can you help me with?'",
+        "Using file operations": "200model8cli read README.md\n200model8cli write test.txt 'Hello World'",
+        "Working with models": "200model8cli models\n200model8cli switch",
+        "Understanding tool calling": "200model8cli ask 'List files in current directory'"
+    }),
+    "git_workflow": MappingProxyType({
+        "Basic Git commands": "200model8cli ask 'Check git status and commit changes'",
+        "AI-generated commit messages": "200model8cli ask 'Create a commit with AI-generated message'",
+        "Branch management": "200model8cli ask 'Create a new feature branch'",
+        "GitHub integration": "200model8cli github create-repo my-project"
+    })
+})
+
+_PRACTICE_EXERCISES = (
+    "Use the file operations to create and read a file",
+    "Search for information about Python programming",
+    "Check the status of a Git repository",
+    "List available AI models and switch to a different one",
+    "Create a simple workflow using multiple tools",
+)
+
+@dataclass(frozen=True)
+class QuizQuestion:
+    """Multiple-choice quiz question"""
+    __slots__ = ("question", "options", "correct")
+    
+    question: str
+    options: Tuple[str, ...]
+    correct: int
+
+
+_MENU_CHOICES = ("topics", "search", "practice", "quiz", "help", "exit")
+
+_QUIZ_CHOICES = ("1", "2", "3")
+
+# Number of questions asked per quiz
+QUIZ_SIZE = 5
+
+_QUIZ: Tuple[QuizQuestion, ...] = (
+    QuizQuestion(
+        question="What command starts interactive mode?",
+        options=("200model8cli", "200model8cli interactive", "200model8cli start"),
+        correct=0
+    ),
+    QuizQuestion(
+        question="How do you list available models?",
+        options=("200model8cli list", "200model8cli models", "200model8cli show"),
+        correct=1
+    ),
+    QuizQuestion(
+        question="What tool category handles file operations?",
+        options=("system_tools", "file_ops", "web_tools"),
+        correct=1
+    ),
+)
+
+
+_MAIN_MENU_TEXT = Text.from_markup(
+    "\n[bold cyan]📚 Learning Menu:[/bold cyan]\n"
+    "1. [blue]topics[/blue]   - Explore learning topics\n"
+    "2. [blue]search[/blue]   - Search knowledge base\n"
+    "3. [blue]practice[/blue] - Practice with examples\n"
+    "4. [blue]quiz[/blue]     - Test your knowledge\n"
+    "5. [blue]help[/blue]     - Get help and tips\n"
+    "6. [blue]exit[/blue]     - Exit learning mode"
+)
+
+_TOPICS_HEADING = Text.from_markup("\n[bold cyan]📖 Available Topics:[/bold cyan]")
+
+_PRACTICE_LIST_TEXT = Text("\n".join(
+    f"{i}. {exercise}" for i, exercise in enumerate(_PRACTICE_EXERCISES, 1)
+))
+
+_WELCOME_PANEL = Panel(
+    Text.from_markup(
+        "[bold blue]🎓 Welcome to 200Model8CLI Learning Mode![/bold blue]\n\n"
+        "This interactive mode will help you learn how to use 200Model8CLI effectively.\n"
+        "You can explore different topics, get explanations, and practice with real examples."
+    ),
+    title="Learning Mode",
+    border_style="blue"
+)
+
+_PRACTICE_PANEL = Panel(
+    Text.from_markup(
+        "[bold blue]🏋️ Practice Mode[/bold blue]\n\n"
+        "Try these exercises to improve your 200Model8CLI skills:"
+    ),
+    title="Practice",
+    border_style="blue"
+)
+
+_QUIZ_PANEL = Panel(
+    Text.from_markup(
+        "[bold blue]🧠 Quiz Mode[/bold blue]\n\n"
+        "Test your knowledge of 200Model8CLI!"
+    ),
+    title="Quiz",
+    border_style="blue"
+)
+
+_HELP_PANEL = Panel(
+    Text.from_markup(
+        "[bold blue]💡 Tips and Help[/bold blue]\n\n"
+        "• Use 'ask' command for natural language requests\n"
+        "• Try 'switch' to change AI models\n"
+        "• Use 'agent' mode for complex tasks\n"
+        "• Check 'github' commands for repository management\n"
+        "• Explore 'knowledge' tools for information management\n\n"
+        "[bold]Need more help?[/bold]\n"
+        "• Type '200model8cli --help' for command reference\n"
+        "• Use interactive mode for guided assistance\n"
+        "• Check the documentation for detailed guides"
+    ),
+    title="Help & Tips",
+    border_style="blue"
+)
+
+
+if hasattr(asyncio, "to_thread"):
+    _to_thread = asyncio.to_thread
+else:
+    async def _to_thread(func, *args, **kwargs):
+        """Fallback for asyncio.to_thread, which needs Python 3.9"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+
+def _is_retryable_error(error: BaseException) -> bool:
+    """Check whether a failed lesson request is worth retrying"""
+    # The API client re-raises failures as OpenRouterError, so look at the chain
+    while error is not None:
+        if isinstance(error, (asyncio.TimeoutError, RateLimitError, httpx.RequestError)):
+            return True
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code >= 500
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _parse_choice(text: str, low: int, high: int) -> Optional[int]:
+    """Parse a numbered menu choice, returning None if invalid or out of range"""
+    try:
+        value = int(text)
+    except ValueError:
+        return None
+    return value if low <= value <= high else None
+
+
+@lru_cache(maxsize=None)
+def _topic_overview(topic_id: str) -> Group:
+    """Render a topic's overview panel and lesson list"""
+    topic = _TOPICS[topic_id]
+    lessons = Text.from_markup("\n[bold cyan]📝 Lessons:[/bold cyan]\n")
+    lessons.append("\n".join(
+        f"{i}. {lesson}" for i, lesson in enumerate(topic["lessons"], 1)
+    ))
+    
+    return Group(
+        Panel(
+            f"[bold]{topic['title']}[/bold]\n\n{topic['description']}",
+            title="Topic Overview",
+            border_style="cyan"
+        ),
+        lessons,
+    )
+
+
+@lru_cache(maxsize=None)
+def _lesson_header(topic_id: str, lesson_idx: int) -> Panel:
+    """Render the header panel shown above a lesson"""
+    topic = _TOPICS[topic_id]
+    return Panel(
+        f"[bold blue]Lesson: {topic['lessons'][lesson_idx]}[/bold blue]",
+        title=f"{topic['title']} - Lesson {lesson_idx + 1}",
+        border_style="blue"
+    )
+
 
 class LearningMode:
     """Interactive learning mode"""
     
+    topics = _TOPICS
+    
     def __init__(self, config: Config, api_client: OpenRouterClient, model_manager: ModelManager, tool_registry: ToolRegistry):
         self.config = config
         self.api_client = api_client
         self.model_manager = model_manager
         self.tool_registry = tool_registry
-        self.knowledge_db = KnowledgeDatabase(config.config_dir / "knowledge.db")
-        
-        # Learning topics
-        self.topics = {
-            "cli_basics": {
-                "title": "CLI Basics",
-                "description": "Learn the fundamentals of using 200Model8CLI",
-                "lessons": [
-                    "Getting started with interactive mode",
-                    "Using file operations",
-                    "Working with models",
-                    "Understanding tool calling"
-                ]
-            },
-            "git_workflow": {
-                "title": "Git Workflow",
-                "description": "Master Git operations with AI assistance",
-                "lessons": [
-                    "Basic Git commands",
-                    "AI-generated commit messages",
-                    "Branch management",
-                    "GitHub integration"
-                ]
-            },
-            "web_automation": {
-                "title": "Web Automation",
-                "description": "Learn web search and browser automation",
-                "lessons": [
-                    "Web search techniques",
-                    "Browser automation",
-                    "Content extraction",
-                    "Research workflows"
-                ]
-            },
-            "code_analysis": {
-                "title": "Code Analysis",
-                "description": "Understand code analysis and improvement",
-                "lessons": [
-                    "Code review with AI",
-                    "Automated testing",
-                    "Code formatting",
-                    "Performance optimization"
-                ]
-            },
-            "advanced_features": {
-                "title": "Advanced Features",
-                "description": "Explore advanced 200Model8CLI capabilities",
-                "lessons": [
-                    "Session management",
-                    "Custom workflows",
-                    "Agent mode",
-                    "Knowledge management"
-                ]
-            }
-        }
+        
+        # Background tasks generating every lesson of a topic in one request
+        self._prefetch_tasks: Dict[str, asyncio.Task] = {}
+        
+        # Recently used lessons and search results, least recently used first
+        self._lesson_memory: "OrderedDict[Tuple[str, str, str, str], str]" = OrderedDict()
+        self._search_memory: "OrderedDict[Tuple[str, int], Tuple[float, List[KnowledgeEntry]]]" = OrderedDict()
+        
+        # The topics never change, so the overview table and prompt choices are built once
+        self._topics_table = self._build_topics_table()
+        self._topic_choices = (*self.topics.keys(), "back")
+    
+    @cached_property
+    def knowledge_db(self) -> KnowledgeDatabase:
+        """Knowledge database, opened on first use"""
+        return KnowledgeDatabase(self.config.config_dir / "knowledge.db")
+    
+    def _build_topics_table(self) -> Table:
+        """Build the topics overview table"""
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Topic", style="cyan")
+        table.add_column("Description", style="white")
+        table.add_column("Lessons", style="yellow")
+        
+        for topic in self.topics.values():
+            table.add_row(
+                topic["title"],
+                topic["description"],
+                str(len(topic["lessons"]))
+            )
+        
+        return table
     
     async def start_learning_mode(self):
         """Start interactive learning mode"""
-        console.print(Panel(
-            "[bold blue]🎓 Welcome to 200Model8CLI Learning Mode![/bold blue]\n\n"
-            "This interactive mode will help you learn how to use 200Model8CLI effectively.\n"
-            "You can explore different topics, get explanations, and practice with real examples.",
-            title="Learning Mode",
-            border_style="blue"
-        ))
+        console.print(_WELCOME_PANEL)
         
         while True:
             try:
                 choice = await self._show_main_menu()
                 
-                if choice == "topics":
-                    await self._explore_topics()
-                elif choice == "search":
-                    await self._search_knowledge()
-                elif choice == "practice":
-                    await self._practice_mode()
-                elif choice == "quiz":
-                    await self._quiz_mode()
-                elif choice == "help":
-                    await self._show_help()
-                elif choice == "exit":
+                if choice == "exit":
                     console.print("[green]Thanks for learning! Happy coding! 🚀[/green]")
                     break
+                
+                handler = self._MENU_DISPATCH.get(choice)
+                if handler:
+                    await handler(self)
                     
             except KeyboardInterrupt:
                 console.print("\n[yellow]Learning mode interrupted. Goodbye![/yellow]")
                 break
             except Exception as e:
                 console.print(f"[red]Error in learning mode: {e}[/red]")
+        
+        for task in self._prefetch_tasks.values():
+            task.cancel()
     
     async def _show_main_menu(self) -> str:
         """Show main learning menu"""
-        console.print("\n[bold cyan]📚 Learning Menu:[/bold cyan]")
-        console.print("1. [blue]topics[/blue]   - Explore learning topics")
-        console.print("2. [blue]search[/blue]   - Search knowledge base")
-        console.print("3. [blue]practice[/blue] - Practice with examples")
-        console.print("4. [blue]quiz[/blue]     - Test your knowledge")
-        console.print("5. [blue]help[/blue]     - Get help and tips")
-        console.print("6. [blue]exit[/blue]     - Exit learning mode")
+        console.print(_MAIN_MENU_TEXT)
         
         choice = Prompt.ask("\nWhat would you like to do?", 
-                          choices=["topics", "search", "practice", "quiz", "help", "exit"],
+                          choices=_MENU_CHOICES,
                           default="topics")
         return choice
     
     async def _explore_topics(self):
         """Explore learning topics"""
-        console.print("\n[bold cyan]📖 Available Topics:[/bold cyan]")
-        
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("Topic", style="cyan")
-        table.add_column("Description", style="white")
-        table.add_column("Lessons", style="yellow")
-        
-        for topic_id, topic in self.topics.items():
-            table.add_row(
-                topic["title"],
-                topic["description"],
-                str(len(topic["lessons"]))
-            )
-        
-        console.print(table)
+        console.print(_TOPICS_HEADING)
+        console.print(self._topics_table)
         
         topic_choice = Prompt.ask("\nWhich topic would you like to explore?",
-                                choices=list(self.topics.keys()) + ["back"],
+                                choices=self._topic_choices,
                                 default="back")
         
         if topic_choice != "back":
@@ -167,34 +406,30 @@ class LearningMode:
         """Explore a specific topic"""
         topic = self.topics[topic_id]
         
-        console.print(Panel(
-            f"[bold]{topic['title']}[/bold]\n\n{topic['description']}",
-            title="Topic Overview",
-            border_style="cyan"
-        ))
+        # Generate the topic's lessons while the user is still choosing one
+        if topic_id not in self._prefetch_tasks:
+            self._prefetch_tasks[topic_id] = asyncio.create_task(
+                self._prefetch_topic_lessons(topic_id)
+            )
         
-        console.print("\n[bold cyan]📝 Lessons:[/bold cyan]")
-        for i, lesson in enumerate(topic["lessons"], 1):
-            console.print(f"{i}. {lesson}")
+        console.print(_topic_overview(topic_id))
         
-        lesson_choice = Prompt.ask(f"\nWhich lesson (1-{len(topic['lessons'])}) or 'back'?",
-                                 default="back")
+        # Prompt in a thread so the prefetch can make progress meanwhile
+        lesson_choice = await _to_thread(
+            Prompt.ask,
+            f"\nWhich lesson (1-{len(topic['lessons'])}) or 'back'?",
+            default="back"
+        )
         
-        if lesson_choice != "back" and lesson_choice.isdigit():
-            lesson_idx = int(lesson_choice) - 1
-            if 0 <= lesson_idx < len(topic["lessons"]):
-                await self._show_lesson(topic_id, lesson_idx)
+        lesson_number = _parse_choice(lesson_choice, 1, len(topic["lessons"]))
+        if lesson_number is not None:
+            await self._show_lesson(topic_id, lesson_number - 1)
     
     async def _show_lesson(self, topic_id: str, lesson_idx: int):
         """Show a specific lesson"""
-        topic = self.topics[topic_id]
-        lesson_title = topic["lessons"][lesson_idx]
+        lesson_title = self.topics[topic_id]["lessons"][lesson_idx]
         
-        console.print(Panel(
-            f"[bold blue]Lesson: {lesson_title}[/bold blue]",
-            title=f"{topic['title']} - Lesson {lesson_idx + 1}",
-            border_style="blue"
-        ))
+        console.print(_lesson_header(topic_id, lesson_idx))
         
         # Generate lesson content using AI
         await self._generate_lesson_content(topic_id, lesson_title)
@@ -204,32 +439,38 @@ class LearningMode:
             await self._show_practical_example(topic_id, lesson_title)
     
     async def _generate_lesson_content(self, topic_id: str, lesson_title: str):
-        """Generate lesson content using AI"""
+        """Generate lesson content using AI, reusing cached lessons when available"""
         try:
-            prompt = f"""
-            Create a comprehensive lesson about "{lesson_title}" for 200Model8CLI users.
-            
-            The lesson should include:
-            1. Clear explanation of the concept
-            2. Step-by-step instructions
-            3. Common use cases
-            4. Best practices
-            5. Tips and tricks
+            prompt, prompt_hash = self._lesson_prompt(lesson_title)
+            model = self.config.default_model
             
-            Keep it practical and focused on 200Model8CLI features.
-            Format the response in markdown.
-            """
+            # A finished prefetch has already cached its lessons; an unfinished one
+            # isn't waited for, the lesson is streamed on demand instead
+            content = await self._get_cached_lesson(topic_id, lesson_title, model, prompt_hash)
             
-            from ..core.api import Message
-            messages = [Message(role="user", content=prompt)]
-            
-            response = await self.api_client.chat_completion(
-                messages=messages,
-                max_tokens=1000
-            )
+            if content is None:
+                messages = [Message(role="user", content=prompt)]
+                
+                if self.config.ui.streaming and self.api_client.is_openrouter_model(model):
+                    # Streamed lessons are rendered as they arrive
+                    content = await self._stream_lesson_content(messages, model)
+                    if content:
+                        await self._cache_lesson(topic_id, lesson_title, model, prompt_hash, content)
+                    return
+                
+                response = await self._call_lesson_api(
+                    messages,
+                    model,
+                    timeout=self.config.api.timeout,
+                    max_tokens=1000
+                )
+                
+                if response.choices:
+                    content = response.choices[0].get("message", {}).get("content")
+                    if content:
+                        await self._cache_lesson(topic_id, lesson_title, model, prompt_hash, content)
             
-            if response.choices:
-                content = response.choices[0].message.content
+            if content:
                 markdown = Markdown(content)
                 console.print(Panel(markdown, title="Lesson Content", border_style="green"))
             
@@ -243,25 +484,210 @@ class LearningMode:
                 border_style="yellow"
             ))
     
+    async def _get_cached_lesson(
+        self, topic_id: str, lesson_title: str, model: str, prompt_hash: str
+    ) -> Optional[str]:
+        """Look up a cached lesson in memory, then on disk without blocking the event loop"""
+        key = (topic_id, lesson_title, model, prompt_hash)
+        content = self._lesson_memory.get(key)
+        if content is not None:
+            self._lesson_memory.move_to_end(key)
+            return content
+        
+        content = await _to_thread(
+            self.knowledge_db.get_cached_lesson, topic_id, lesson_title, model, prompt_hash
+        )
+        if content is not None:
+            self._remember_lesson(key, content)
+        return content
+    
+    async def _cache_lesson(
+        self, topic_id: str, lesson_title: str, model: str, prompt_hash: str, content: str
+    ):
+        """Store a generated lesson without blocking the event loop"""
+        self._remember_lesson((topic_id, lesson_title, model, prompt_hash), content)
+        await _to_thread(
+            self.knowledge_db.cache_lesson, topic_id, lesson_title, model, prompt_hash, content
+        )
+    
+    def _remember_lesson(self, key: Tuple[str, str, str, str], content: str):
+        """Keep a lesson in the in-memory cache, evicting the least recently used"""
+        self._lesson_memory[key] = content
+        self._lesson_memory.move_to_end(key)
+        if len(self._lesson_memory) > LESSON_MEMORY_CACHE_SIZE:
+            self._lesson_memory.popitem(last=False)
+    
+    async def _search_entries(self, query: str, limit: int) -> List[KnowledgeEntry]:
+        """Search the knowledge base, reusing recent results for the same query"""
+        key = (query, limit)
+        now = time.monotonic()
+        cached = self._search_memory.get(key)
+        if cached is not None and now - cached[0] < SEARCH_MEMORY_CACHE_TTL:
+            self._search_memory.move_to_end(key)
+            return cached[1]
+        
+        entries = await _to_thread(self.knowledge_db.search_entries, query, limit=limit)
+        self._search_memory[key] = (now, entries)
+        self._search_memory.move_to_end(key)
+        if len(self._search_memory) > SEARCH_MEMORY_CACHE_SIZE:
+            self._search_memory.popitem(last=False)
+        return entries
+    
+    @staticmethod
+    def _lesson_prompt(lesson_title: str) -> Tuple[str, str]:
+        """Build the lesson prompt and the hash it is cached under"""
+        prompt = LESSON_PROMPT_TEMPLATE.format(lesson_title=lesson_title)
+        return prompt, hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+    
+    async def _prefetch_topic_lessons(self, topic_id: str):
+        """Generate all uncached lessons of a topic in one request and cache them"""
+        model = self.config.default_model
+        pending = {}
+        for lesson_title in self.topics[topic_id]["lessons"]:
+            _, prompt_hash = self._lesson_prompt(lesson_title)
+            if await self._get_cached_lesson(topic_id, lesson_title, model, prompt_hash) is None:
+                pending[lesson_title] = prompt_hash
+        
+        if not pending:
+            return
+        
+        try:
+            prompt = LESSON_BATCH_PROMPT_TEMPLATE.format(
+                lesson_list="\n".join(f"- {title}" for title in pending)
+            )
+            
+            response = await self._call_lesson_api(
+                [Message(role="user", content=prompt)],
+                model,
+                timeout=self.config.api.timeout * len(pending),
+                max_tokens=1000 * len(pending),
+                response_format={"type": "json_object"}
+            )
+            
+            if not response.choices:
+                return
+            
+            text = response.choices[0].get("message", {}).get("content") or ""
+            # Some models wrap JSON replies in a code fence
+            text = text.strip()
+            if text.startswith("```json"):
+                text = text[7:]
+            if text.startswith("```"):
+                text = text[3:]
+            if text.endswith("```"):
+                text = text[:-3]
+            
+            for lesson in json.loads(text).get("lessons", []):
+                prompt_hash = pending.get(lesson.get("title"))
+                # Keep lessons that were streamed on demand in the meantime
+                key = (topic_id, lesson.get("title"), model, prompt_hash)
+                if prompt_hash and lesson.get("markdown") and key not in self._lesson_memory:
+                    await self._cache_lesson(
+                        topic_id, lesson["title"], model, prompt_hash, lesson["markdown"]
+                    )
+        except Exception as e:
+            # Lessons that were not prefetched are generated on demand
+            logger.debug("Lesson prefetch failed", topic=topic_id, error=str(e))
+    
+    async def _call_lesson_api(
+        self, messages: List[Message], model: str, timeout: float, **kwargs
+    ) -> Any:
+        """Request a lesson completion with a timeout, retrying transient failures"""
+        for attempt in range(1, LESSON_MAX_ATTEMPTS + 1):
+            try:
+                return await asyncio.wait_for(
+                    self.api_client.chat_completion(messages=messages, model=model, **kwargs),
+                    timeout=timeout
+                )
+            except Exception as e:
+                if attempt == LESSON_MAX_ATTEMPTS or not _is_retryable_error(e):
+                    raise
+                await self._retry_backoff(attempt, e)
+    
+    @staticmethod
+    async def _retry_backoff(attempt: int, error: BaseException):
+        """Sleep with jittered exponential backoff before retrying a lesson request"""
+        delay = min(2 ** (attempt - 1), LESSON_MAX_BACKOFF) + random.uniform(0, 1)
+        logger.warning(
+            "Lesson request failed, retrying",
+            attempt=attempt,
+            delay=delay,
+            error=str(error)
+        )
+        await asyncio.sleep(delay)
+    
+    async def _stream_lesson_content(self, messages: List[Message], model: str) -> str:
+        """Stream lesson content into a live panel and return the full text
+        
+        Opening the stream and every chunk wait are bounded by the API timeout;
+        failures are retried like _call_lesson_api until any text has been shown.
+        """
+        timeout = self.config.api.timeout
+        for attempt in range(1, LESSON_MAX_ATTEMPTS + 1):
+            received = []
+            try:
+                return await self._stream_lesson_once(messages, model, timeout, received)
+            except Exception as e:
+                if received or attempt == LESSON_MAX_ATTEMPTS or not _is_retryable_error(e):
+                    raise
+                await self._retry_backoff(attempt, e)
+    
+    async def _stream_lesson_once(
+        self, messages: List[Message], model: str, timeout: float, received: List[str]
+    ) -> str:
+        """One streaming attempt; text pieces are appended to received as they arrive"""
+        chunks = await asyncio.wait_for(
+            self.api_client.chat_completion(
+                messages=messages,
+                model=model,
+                max_tokens=1000,
+                stream=True
+            ),
+            timeout=timeout
+        )
+        iterator = chunks.__aiter__()
+        
+        content = ""
+        last_render = 0.0
+        try:
+            with Live(
+                Panel(Markdown(""), title="Lesson Content", border_style="green"),
+                console=console,
+                refresh_per_second=8,
+            ) as live:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(iterator.__anext__(), timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    
+                    choices = chunk.get("choices") or []
+                    if not choices:
+                        continue
+                    
+                    text = (choices[0].get("delta") or {}).get("content")
+                    if not text:
+                        continue
+                    
+                    received.append(text)
+                    content += text
+                    now = time.monotonic()
+                    if now - last_render >= LESSON_RENDER_INTERVAL:
+                        live.update(Panel(Markdown(content), title="Lesson Content", border_style="green"))
+                        last_render = now
+                
+                live.update(Panel(Markdown(content), title="Lesson Content", border_style="green"))
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        
+        return content
+    
     async def _show_practical_example(self, topic_id: str, lesson_title: str):
         """Show practical example for the lesson"""
-        examples = {
-            "cli_basics": {
-                "Getting started with interactive mode": "200model8cli\n# Then try: ask 'What can you help me with?'",
-                "Using file operations": "200model8cli read README.md\n200model8cli write test.txt 'Hello World'",
-                "Working with models": "200model8cli models\n200model8cli switch",
-                "Understanding tool calling": "200model8cli ask 'List files in current directory'"
-            },
-            "git_workflow": {
-                "Basic Git commands": "200model8cli ask 'Check git status and commit changes'",
-                "AI-generated commit messages": "200model8cli ask 'Create a commit with AI-generated message'",
-                "Branch management": "200model8cli ask 'Create a new feature branch'",
-                "GitHub integration": "200model8cli github create-repo my-project"
-            }
-        }
-        
-        if topic_id in examples and lesson_title in examples[topic_id]:
-            example = examples[topic_id][lesson_title]
+        example = _EXAMPLES.get(topic_id, {}).get(lesson_title)
+        if example:
             console.print(Panel(
                 f"[bold green]Try this example:[/bold green]\n\n[code]{example}[/code]",
                 title="Practical Example",
@@ -279,7 +705,7 @@ class LearningMode:
         query = Prompt.ask("What would you like to search for?")
         
         if query:
-            entries = self.knowledge_db.search_entries(query, limit=5)
+            entries = await self._search_entries(query, 5)
             
             if entries:
                 console.print(f"\n[green]Found {len(entries)} results for '{query}':[/green]")
@@ -304,49 +730,29 @@ class LearningMode:
         category = Prompt.ask("Enter category", default="general")
         tags_input = Prompt.ask("Enter tags (comma-separated)", default="")
         
-        tags = [tag.strip() for tag in tags_input.split(",") if tag.strip()]
-        
-        from ..tools.knowledge_tools import AddKnowledgeTool
-        tool = AddKnowledgeTool(self.config)
+        tags = parse_tags(tags_input)
         
-        result = await tool.execute(
-            title=title,
-            content=content,
-            category=category,
-            tags=tags,
-            source="learning_mode"
-        )
+        entry = KnowledgeEntry.create(title, content, category, tags, source="learning_mode")
         
-        if result.success:
+        if await _to_thread(self.knowledge_db.add_entry, entry):
+            # New entries can change the results of any earlier search
+            self._search_memory.clear()
             console.print("[green]✅ Knowledge entry added successfully![/green]")
         else:
-            console.print(f"[red]❌ Failed to add knowledge entry: {result.error}[/red]")
+            console.print("[red]❌ Failed to add knowledge entry[/red]")
     
     async def _practice_mode(self):
         """Practice mode with guided exercises"""
-        console.print(Panel(
-            "[bold blue]🏋️ Practice Mode[/bold blue]\n\n"
-            "Try these exercises to improve your 200Model8CLI skills:",
-            title="Practice",
-            border_style="blue"
-        ))
+        console.print(_PRACTICE_PANEL)
         
-        exercises = [
-            "Use the file operations to create and read a file",
-            "Search for information about Python programming",
-            "Check the status of a Git repository",
-            "List available AI models and switch to a different one",
-            "Create a simple workflow using multiple tools"
-        ]
+        console.print(_PRACTICE_LIST_TEXT)
         
-        for i, exercise in enumerate(exercises, 1):
-            console.print(f"{i}. {exercise}")
-        
-        choice = Prompt.ask(f"Which exercise (1-{len(exercises)}) would you like to try?",
+        choice = Prompt.ask(f"Which exercise (1-{len(_PRACTICE_EXERCISES)}) would you like to try?",
                           default="1")
         
-        if choice.isdigit() and 1 <= int(choice) <= len(exercises):
-            exercise = exercises[int(choice) - 1]
+        exercise_number = _parse_choice(choice, 1, len(_PRACTICE_EXERCISES))
+        if exercise_number is not None:
+            exercise = _PRACTICE_EXERCISES[exercise_number - 1]
             console.print(Panel(
                 f"[bold green]Exercise:[/bold green] {exercise}\n\n"
                 f"Try to complete this exercise using 200Model8CLI commands.",
@@ -354,68 +760,44 @@ class LearningMode:
                 border_style="green"
             ))
     
-    async def _quiz_mode(self):
-        """Quiz mode to test knowledge"""
-        console.print(Panel(
-            "[bold blue]🧠 Quiz Mode[/bold blue]\n\n"
-            "Test your knowledge of 200Model8CLI!",
-            title="Quiz",
-            border_style="blue"
-        ))
+    async def _quiz_mode(self, seed: Optional[int] = None):
+        """Quiz mode to test knowledge on a random sample of questions"""
+        console.print(_QUIZ_PANEL)
         
-        questions = [
-            {
-                "question": "What command starts interactive mode?",
-                "options": ["200model8cli", "200model8cli interactive", "200model8cli start"],
-                "correct": 0
-            },
-            {
-                "question": "How do you list available models?",
-                "options": ["200model8cli list", "200model8cli models", "200model8cli show"],
-                "correct": 1
-            },
-            {
-                "question": "What tool category handles file operations?",
-                "options": ["system_tools", "file_ops", "web_tools"],
-                "correct": 1
-            }
-        ]
+        rng = random.Random(seed if seed is not None else time.monotonic_ns())
+        selected = rng.sample(_QUIZ, k=min(QUIZ_SIZE, len(_QUIZ)))
         
         score = 0
-        for i, q in enumerate(questions, 1):
-            console.print(f"\n[bold cyan]Question {i}:[/bold cyan] {q['question']}")
+        for i, q in enumerate(selected, 1):
+            console.print(f"\n[bold cyan]Question {i}:[/bold cyan] {q.question}")
             
-            for j, option in enumerate(q['options']):
+            for j, option in enumerate(q.options):
                 console.print(f"{j + 1}. {option}")
             
-            answer = Prompt.ask("Your answer (1-3)", choices=["1", "2", "3"])
+            answer = Prompt.ask("Your answer (1-3)", choices=_QUIZ_CHOICES)
             
-            if int(answer) - 1 == q['correct']:
+            if _parse_choice(answer, 1, len(q.options)) == q.correct + 1:
                 console.print("[green]✅ Correct![/green]")
                 score += 1
             else:
-                correct_answer = q['options'][q['correct']]
+                correct_answer = q.options[q.correct]
                 console.print(f"[red]❌ Incorrect. The correct answer is: {correct_answer}[/red]")
         
         console.print(Panel(
-            f"[bold]Quiz Complete![/bold]\n\nYour score: {score}/{len(questions)}",
+            f"[bold]Quiz Complete![/bold]\n\nYour score: {score}/{len(selected)}",
             title="Results",
-            border_style="green" if score == len(questions) else "yellow"
+            border_style="green" if score == len(selected) else "yellow"
         ))
     
     async def _show_help(self):
         """Show help and tips"""
-        console.print(Panel(
-            "[bold blue]💡 Tips and Help[/bold blue]\n\n"
-            "• Use 'ask' command for natural language requests\n"
-            "• Try 'switch' to change AI models\n"
-            "• Use 'agent' mode for complex tasks\n"
-            "• Check 'github' commands for repository management\n"
-            "• Explore 'knowledge' tools for information management\n\n"
-            "[bold]Need more help?[/bold]\n"
-            "• Type '200model8cli --help' for command reference\n"
-            "• Use interactive mode for guided assistance\n"
-            "• Check the documentation for detailed guides",
-            title="Help & Tips",
-            border_style="blue"
-        ))
+        console.print(_HELP_PANEL)
+    
+    # Main menu choices mapped to their handlers ("exit" is handled by the loop)
+    _MENU_DISPATCH = {
+        "topics": _explore_topics,
+        "search": _search_knowledge,
+        "practice": _practice_mode,
+        "quiz": _quiz_mode,
+        "help": _show_help,
+    }
@@ -4,9 +4,26 @@ Utils module for 200Model8CLI
 Contains utility functions, helpers, and security utilities.
 """
 
-from .helpers import *
+from .helpers import (
+    create_temp_file,
+    detect_file_language,
+    extract_code_blocks,
+    format_file_size,
+    get_file_info,
+    get_system_info,
+    is_binary_file,
+    truncate_text,
+)
 from .security import SecurityValidator
 
 __all__ = [
     "SecurityValidator",
+    "create_temp_file",
+    "detect_file_language",
+    "extract_code_blocks",
+    "format_file_size",
+    "get_file_info",
+    "get_system_info",
+    "is_binary_file",
+    "truncate_text",
 ]
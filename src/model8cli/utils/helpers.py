@@ -5,24 +5,156 @@ Common utility functions used throughout the application.
 """
 
 import os
+import stat
 import sys
 import time
 import asyncio
 import hashlib
+import fnmatch
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, Callable, TypeVar, Awaitable
+from typing import (
+    Dict, List, Optional, Any, Union, Callable, TypeVar, Awaitable, Iterable, Iterator, Sequence, Tuple
+)
+from collections import OrderedDict
 from datetime import datetime, timezone
 import json
 import yaml
 import re
+from functools import lru_cache, wraps
+from itertools import islice
+from types import MappingProxyType
 
 import structlog
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    from blake3 import blake3 as _fast_hash
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    _fast_hash = None
+    BLAKE3_AVAILABLE = False
+
+# Prefer the libyaml-backed loader and dumper when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as YamlSafeLoader, CSafeDumper as YamlSafeDumper
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader, SafeDumper as YamlSafeDumper
+
+# Public helpers; the YAML loader and dumper are re-exported for other modules
+__all__ = [
+    "BINARY_SNIFF_SIZE",
+    "BLAKE3_AVAILABLE",
+    "HASH_CHUNK_SIZE",
+    "YamlSafeDumper",
+    "YamlSafeLoader",
+    "get_project_root",
+    "ensure_directory",
+    "get_file_hash",
+    "fast_content_hash",
+    "get_file_hash_async",
+    "get_file_info",
+    "format_file_size",
+    "format_duration",
+    "format_timestamp",
+    "truncate_text",
+    "extract_code_blocks",
+    "detect_file_language",
+    "safe_json_loads",
+    "safe_yaml_loads",
+    "merge_dicts",
+    "flatten_dict",
+    "chunk_list",
+    "chunk_list_views",
+    "debounce",
+    "async_debounce",
+    "retry_with_backoff",
+    "async_retry_with_backoff",
+    "get_system_info",
+    "create_temp_file",
+    "cleanup_temp_files",
+    "validate_email",
+    "generate_id",
+    "is_binary_file",
+    "get_line_count",
+    "scan_file",
+]
+
 logger = structlog.get_logger(__name__)
 
 T = TypeVar('T')
 
+_IS_WINDOWS = sys.platform == 'win32'
+
+_CODE_BLOCK_RE = re.compile(r'```(\w+)?\n(.*?)\n```', re.DOTALL)
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+_LANG_MAP = MappingProxyType({
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.jsx': 'jsx',
+    '.tsx': 'tsx',
+    '.java': 'java',
+    '.cpp': 'cpp',
+    '.c': 'c',
+    '.h': 'c',
+    '.cs': 'csharp',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.php': 'php',
+    '.rb': 'ruby',
+    '.swift': 'swift',
+    '.kt': 'kotlin',
+    '.scala': 'scala',
+    '.clj': 'clojure',
+    '.hs': 'haskell',
+    '.ml': 'ocaml',
+    '.r': 'r',
+    '.sql': 'sql',
+    '.html': 'html',
+    '.css': 'css',
+    '.scss': 'scss',
+    '.less': 'less',
+    '.vue': 'vue',
+    '.json': 'json',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.xml': 'xml',
+    '.toml': 'toml',
+    '.ini': 'ini',
+    '.cfg': 'ini',
+    '.conf': 'ini',
+    '.md': 'markdown',
+    '.rst': 'rst',
+    '.sh': 'bash',
+    '.bat': 'batch',
+    '.ps1': 'powershell',
+    '.dockerfile': 'dockerfile',
+    '.makefile': 'makefile',
+    '.cmake': 'cmake',
+    '.gradle': 'gradle',
+})
+
+# Leading bytes inspected when deciding whether a file is binary
+BINARY_SNIFF_SIZE = 4096
+
+# Read size used when hashing or scanning files without hashlib.file_digest
+HASH_CHUNK_SIZE = 1 << 20
+
+# File digests keyed on (resolved path, size, mtime_ns), most recently used last
+_HASH_CACHE: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_HASH_CACHE_SIZE = 4096
+
 
 def get_project_root() -> Path:
     """Get the project root directory"""
@@ -44,13 +176,70 @@ def ensure_directory(path: Union[str, Path]) -> Path:
 def get_file_hash(file_path: Union[str, Path]) -> str:
     """Get SHA256 hash of a file"""
     path = Path(file_path)
-    if not path.exists():
+    try:
+        st = path.stat()
+    except OSError:
         return ""
     
-    hash_sha256 = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_sha256.update(chunk)
+    return _get_file_hash_with_stat(path, st)
+
+
+def fast_content_hash(data: Union[str, bytes]) -> str:
+    """Non-cryptographic content key for caches and de-duplication (BLAKE3 when installed)"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if _fast_hash is not None:
+        return _fast_hash(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+async def get_file_hash_async(file_path: Union[str, Path]) -> str:
+    """Get SHA256 hash of a file without blocking the event loop"""
+    # hashlib releases the GIL while hashing, so a worker thread overlaps
+    # the reads and the digest with other tasks on the loop
+    return await asyncio.get_running_loop().run_in_executor(None, get_file_hash, file_path)
+
+
+def _get_file_hash_with_stat(path: Path, st: os.stat_result) -> str:
+    """Get SHA256 hash of a file whose stat result is already known"""
+    return _hash_cached(str(path.resolve()), st.st_size, st.st_mtime_ns)
+
+
+def _hash_cached(path_str: str, size: int, mtime_ns: int) -> str:
+    """Hash a file; size and mtime are only part of the key so edits invalidate it"""
+    key = (path_str, size, mtime_ns)
+    digest = _HASH_CACHE.get(key)
+    if digest is None:
+        digest = _hash_file(path_str)
+        _remember_hash(key, digest)
+    else:
+        _HASH_CACHE.move_to_end(key)
+    return digest
+
+
+def _remember_hash(key: Tuple[str, int, int], digest: str) -> None:
+    """Store a file digest, evicting the least recently used entries"""
+    _HASH_CACHE[key] = digest
+    _HASH_CACHE.move_to_end(key)
+    while len(_HASH_CACHE) > _HASH_CACHE_SIZE:
+        _HASH_CACHE.popitem(last=False)
+
+
+def _hash_file(path_str: str) -> str:
+    """SHA256 of a file's contents"""
+    with open(path_str, "rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: the read/update loop runs in C with a large buffer
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        
+        hash_sha256 = hashlib.sha256()
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hash_sha256.update(view[:n])
     return hash_sha256.hexdigest()
 
 
@@ -58,27 +247,34 @@ def get_file_info(file_path: Union[str, Path]) -> Dict[str, Any]:
     """Get comprehensive file information"""
     path = Path(file_path)
     
-    if not path.exists():
+    # One lstat (plus a stat for symlinks) instead of a syscall per property
+    try:
+        st = os.lstat(path)
+        is_symlink = stat.S_ISLNK(st.st_mode)
+        if is_symlink:
+            st = os.stat(path)
+    except OSError:
         return {"exists": False}
     
-    stat = path.stat()
+    is_file = stat.S_ISREG(st.st_mode)
+    resolved = str(path.resolve())
     
     return {
         "exists": True,
-        "path": str(path.resolve()),
+        "path": resolved,
         "name": path.name,
         "stem": path.stem,
         "suffix": path.suffix,
-        "size": stat.st_size,
-        "size_mb": stat.st_size / (1024 * 1024),
-        "created": stat.st_ctime,
-        "modified": stat.st_mtime,
-        "accessed": stat.st_atime,
-        "is_file": path.is_file(),
-        "is_dir": path.is_dir(),
-        "is_symlink": path.is_symlink(),
-        "permissions": oct(stat.st_mode)[-3:],
-        "hash": get_file_hash(path) if path.is_file() else None,
+        "size": st.st_size,
+        "size_mb": st.st_size / (1024 * 1024),
+        "created": st.st_ctime,
+        "modified": st.st_mtime,
+        "accessed": st.st_atime,
+        "is_file": is_file,
+        "is_dir": stat.S_ISDIR(st.st_mode),
+        "is_symlink": is_symlink,
+        "permissions": oct(st.st_mode)[-3:],
+        "hash": _hash_cached(resolved, st.st_size, st.st_mtime_ns) if is_file else None,
     }
 
 
@@ -87,13 +283,12 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
     
-    return f"{size_bytes:.1f} {size_names[i]}"
+    # Each unit is 2**10 of the previous one, so the bit length picks the unit
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 
 def format_duration(seconds: float) -> str:
@@ -126,8 +321,7 @@ def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
 
 def extract_code_blocks(text: str) -> List[Dict[str, str]]:
     """Extract code blocks from markdown text"""
-    pattern = r'```(\w+)?\n(.*?)\n```'
-    matches = re.findall(pattern, text, re.DOTALL)
+    matches = _CODE_BLOCK_RE.findall(text)
     
     code_blocks = []
     for language, code in matches:
@@ -141,71 +335,25 @@ def extract_code_blocks(text: str) -> List[Dict[str, str]]:
 
 def detect_file_language(file_path: Union[str, Path]) -> str:
     """Detect programming language from file extension"""
-    path = Path(file_path)
-    extension = path.suffix.lower()
-    
-    language_map = {
-        '.py': 'python',
-        '.js': 'javascript',
-        '.ts': 'typescript',
-        '.jsx': 'jsx',
-        '.tsx': 'tsx',
-        '.java': 'java',
-        '.cpp': 'cpp',
-        '.c': 'c',
-        '.h': 'c',
-        '.cs': 'csharp',
-        '.go': 'go',
-        '.rs': 'rust',
-        '.php': 'php',
-        '.rb': 'ruby',
-        '.swift': 'swift',
-        '.kt': 'kotlin',
-        '.scala': 'scala',
-        '.clj': 'clojure',
-        '.hs': 'haskell',
-        '.ml': 'ocaml',
-        '.r': 'r',
-        '.sql': 'sql',
-        '.html': 'html',
-        '.css': 'css',
-        '.scss': 'scss',
-        '.less': 'less',
-        '.vue': 'vue',
-        '.json': 'json',
-        '.yaml': 'yaml',
-        '.yml': 'yaml',
-        '.xml': 'xml',
-        '.toml': 'toml',
-        '.ini': 'ini',
-        '.cfg': 'ini',
-        '.conf': 'ini',
-        '.md': 'markdown',
-        '.rst': 'rst',
-        '.sh': 'bash',
-        '.bat': 'batch',
-        '.ps1': 'powershell',
-        '.dockerfile': 'dockerfile',
-        '.makefile': 'makefile',
-        '.cmake': 'cmake',
-        '.gradle': 'gradle',
-    }
-    
-    return language_map.get(extension, 'text')
+    extension = os.path.splitext(os.fspath(file_path))[1].lower()
+    return _LANG_MAP.get(extension, 'text')
 
 
 def safe_json_loads(text: str, default: Any = None) -> Any:
-    """Safely load JSON with fallback"""
+    """Safely load JSON with fallback, using orjson when it is installed"""
     try:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(text)
         return json.loads(text)
-    except (json.JSONDecodeError, TypeError):
+    except (ValueError, TypeError):
+        # Both libraries raise ValueError subclasses on malformed input
         return default
 
 
 def safe_yaml_loads(text: str, default: Any = None) -> Any:
     """Safely load YAML with fallback"""
     try:
-        return yaml.safe_load(text)
+        return yaml.load(text, Loader=YamlSafeLoader)
     except (yaml.YAMLError, TypeError):
         return default
 
@@ -214,61 +362,92 @@ def merge_dicts(dict1: Dict[str, Any], dict2: Dict[str, Any]) -> Dict[str, Any]:
     """Recursively merge two dictionaries"""
     result = dict1.copy()
     
-    for key, value in dict2.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = merge_dicts(result[key], value)
-        else:
-            result[key] = value
+    # Walk nested levels with an explicit stack instead of recursing
+    stack = [(result, dict2)]
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            existing = dst.get(key)
+            if isinstance(existing, dict) and isinstance(value, dict):
+                # Copy before merging so dict1's nested dicts are left untouched
+                merged = existing.copy()
+                dst[key] = merged
+                stack.append((merged, value))
+            else:
+                dst[key] = value
     
     return result
 
 
 def flatten_dict(d: Dict[str, Any], parent_key: str = '', sep: str = '.') -> Dict[str, Any]:
     """Flatten nested dictionary"""
-    items = []
-    for k, v in d.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            items.extend(flatten_dict(v, new_key, sep=sep).items())
+    items = {}
+    
+    # Depth-first over a stack of item iterators, which keeps the key order
+    stack = [(parent_key, iter(d.items()))]
+    while stack:
+        prefix, entries = stack[-1]
+        for k, v in entries:
+            new_key = f"{prefix}{sep}{k}" if prefix else k
+            if isinstance(v, dict):
+                stack.append((new_key, iter(v.items())))
+                break
+            items[new_key] = v
         else:
-            items.append((new_key, v))
-    return dict(items)
+            stack.pop()
+    
+    return items
+
 
+def chunk_list(lst: Iterable[T], chunk_size: int) -> Iterator[List[T]]:
+    """Lazily yield lists of up to chunk_size items from any iterable"""
+    it = iter(lst)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
 
-def chunk_list(lst: List[T], chunk_size: int) -> List[List[T]]:
-    """Split list into chunks of specified size"""
-    return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
+
+def chunk_list_views(seq: Sequence[T], chunk_size: int) -> Iterator[Sequence[T]]:
+    """Yield slices of a sequence (zero-copy for memoryview inputs)"""
+    for i in range(0, len(seq), chunk_size):
+        yield seq[i:i + chunk_size]
 
 
 def debounce(wait: float):
     """Debounce decorator for functions"""
     def decorator(func: Callable[..., T]) -> Callable[..., Optional[T]]:
-        last_called = [0.0]
-        result = [None]
+        last_called = float('-inf')
+        result = None
         
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            now = time.time()
-            if now - last_called[0] >= wait:
-                result[0] = func(*args, **kwargs)
-                last_called[0] = now
-            return result[0]
+            nonlocal last_called, result
+            now = time.monotonic()
+            if now - last_called >= wait:
+                result = func(*args, **kwargs)
+                last_called = now
+            return result
         
         return wrapper
     return decorator
 
 
-async def async_debounce(wait: float):
+def async_debounce(wait: float):
     """Async debounce decorator"""
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[Optional[T]]]:
-        last_called = [0.0]
-        result = [None]
+        last_called = float('-inf')
+        result = None
         
+        @wraps(func)
         async def wrapper(*args, **kwargs):
-            now = time.time()
-            if now - last_called[0] >= wait:
-                result[0] = await func(*args, **kwargs)
-                last_called[0] = now
-            return result[0]
+            nonlocal last_called, result
+            now = time.monotonic()
+            if now - last_called >= wait:
+                result = await func(*args, **kwargs)
+                last_called = now
+            return result
         
         return wrapper
     return decorator
@@ -283,6 +462,7 @@ def retry_with_backoff(
 ):
     """Retry decorator with exponential backoff"""
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        @wraps(func)
         def wrapper(*args, **kwargs):
             last_exception = None
             
@@ -310,7 +490,7 @@ def retry_with_backoff(
     return decorator
 
 
-async def async_retry_with_backoff(
+def async_retry_with_backoff(
     max_retries: int = 3,
     base_delay: float = 1.0,
     max_delay: float = 60.0,
@@ -319,6 +499,7 @@ async def async_retry_with_backoff(
 ):
     """Async retry decorator with exponential backoff"""
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @wraps(func)
         async def wrapper(*args, **kwargs):
             last_exception = None
             
@@ -346,8 +527,9 @@ async def async_retry_with_backoff(
     return decorator
 
 
-def get_system_info() -> Dict[str, Any]:
-    """Get system information"""
+@lru_cache(maxsize=None)
+def _static_system_info() -> Dict[str, Any]:
+    """Platform details that can't change while the process runs"""
     import platform
     import psutil
     
@@ -360,17 +542,24 @@ def get_system_info() -> Dict[str, Any]:
         "processor": platform.processor(),
         "python_version": platform.python_version(),
         "cpu_count": psutil.cpu_count(),
-        "memory_total": psutil.virtual_memory().total,
-        "memory_available": psutil.virtual_memory().available,
+    }
+
+
+def get_system_info() -> Dict[str, Any]:
+    """Get system information"""
+    import psutil
+    
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('C:\\' if _IS_WINDOWS else '/')
+    return {
+        **_static_system_info(),
+        "memory_total": memory.total,
+        "memory_available": memory.available,
         "disk_usage": {
-            "total": psutil.disk_usage('/').total,
-            "used": psutil.disk_usage('/').used,
-            "free": psutil.disk_usage('/').free,
-        } if sys.platform != 'win32' else {
-            "total": psutil.disk_usage('C:\\').total,
-            "used": psutil.disk_usage('C:\\').used,
-            "free": psutil.disk_usage('C:\\').free,
-        }
+            "total": disk.total,
+            "used": disk.used,
+            "free": disk.free,
+        },
     }
 
 
@@ -389,20 +578,23 @@ def create_temp_file(content: str, suffix: str = '.tmp', prefix: str = 'model8cl
 
 def cleanup_temp_files(pattern: str = 'model8cli_*'):
     """Clean up temporary files matching pattern"""
-    temp_dir = Path(tempfile.gettempdir())
-    for temp_file in temp_dir.glob(pattern):
-        try:
-            if temp_file.is_file():
-                temp_file.unlink()
-                logger.debug("Cleaned up temp file", file=str(temp_file))
-        except Exception as e:
-            logger.warning("Failed to clean up temp file", file=str(temp_file), error=str(e))
+    # scandir entries carry the file type from the directory read, so matching
+    # and the is_file check don't need a stat per entry
+    with os.scandir(tempfile.gettempdir()) as entries:
+        for entry in entries:
+            if not fnmatch.fnmatch(entry.name, pattern):
+                continue
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    os.unlink(entry.path)
+                    logger.debug("Cleaned up temp file", file=entry.path)
+            except Exception as e:
+                logger.warning("Failed to clean up temp file", file=entry.path, error=str(e))
 
 
 def validate_email(email: str) -> bool:
     """Validate email address format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 
 def generate_id(length: int = 8) -> str:
@@ -417,9 +609,13 @@ def generate_id(length: int = 8) -> str:
 def is_binary_file(file_path: Union[str, Path]) -> bool:
     """Check if file is binary"""
     try:
-        with open(file_path, 'rb') as f:
-            chunk = f.read(1024)
-            return b'\0' in chunk
+        # Raw descriptor read: no buffered file object for a single small read
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            chunk = os.read(fd, BINARY_SNIFF_SIZE)
+        finally:
+            os.close(fd)
+        return chunk.find(b'\0') != -1
     except Exception:
         return True  # Assume binary if can't read
 
@@ -427,7 +623,66 @@ def is_binary_file(file_path: Union[str, Path]) -> bool:
 def get_line_count(file_path: Union[str, Path]) -> int:
     """Get number of lines in a file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return sum(1 for _ in f)
+        count = 0
+        last = b''
+        # Count newline bytes in large chunks rather than decoding line by line
+        with open(file_path, 'rb', buffering=0) as f:
+            while True:
+                chunk = f.read(HASH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                count += chunk.count(b'\n')
+                last = chunk[-1:]
+        
+        # A final line without a trailing newline still counts
+        return count + (1 if last and last != b'\n' else 0)
     except Exception:
         return 0
+
+
+def scan_file(file_path: Union[str, Path], keep_content: bool = False) -> Dict[str, Any]:
+    """Hash, sniff and count lines of a file in a single read pass
+    
+    The digest is also stored in the hash cache, so a following get_file_info
+    or get_file_hash on the unchanged file does not read it again. With
+    keep_content the raw bytes are returned under "content".
+    """
+    hash_sha256 = hashlib.sha256()
+    size = 0
+    count = 0
+    last = b''
+    is_binary = False
+    content = bytearray() if keep_content else None
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    
+    with open(file_path, 'rb', buffering=0) as f:
+        st = os.fstat(f.fileno())
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hash_sha256.update(view[:n])
+            # Same window as is_binary_file: only the leading bytes are sniffed
+            if size < BINARY_SNIFF_SIZE and not is_binary:
+                is_binary = buf.find(b'\0', 0, min(n, BINARY_SNIFF_SIZE - size)) != -1
+            count += buf.count(b'\n', 0, n)
+            last = buf[n - 1:n]
+            size += n
+            if content is not None:
+                content += view[:n]
+    
+    digest = hash_sha256.hexdigest()
+    if size == st.st_size:
+        # Only cache when the file didn't grow or shrink while it was read
+        _remember_hash((str(Path(file_path).resolve()), st.st_size, st.st_mtime_ns), digest)
+    
+    result = {
+        "hash": digest,
+        "is_binary": is_binary,
+        "line_count": count + (1 if last and last != b'\n' else 0),
+        "size": size,
+    }
+    if content is not None:
+        result["content"] = bytes(content)
+    return result
@@ -1,8 +1,13 @@
 """
 Logging utilities for 200Model8CLI
 """
+from functools import lru_cache
+
 import structlog
 
+@lru_cache(maxsize=None)
 def get_logger(name: str):
-    """Get a structured logger instance"""
+    """Get a structured logger instance, shared by every caller using the same name"""
+    # structlog returns a lazy proxy that binds on first use, and with
+    # cache_logger_on_first_use (see cli.setup_logging) it binds only once
     return structlog.get_logger(name)
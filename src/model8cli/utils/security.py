@@ -6,17 +6,58 @@ Provides input validation, safe execution, and security checks.
 
 import os
 import re
+import shutil
 import subprocess
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from urllib.parse import urlparse
 import hashlib
 import tempfile
+from collections import OrderedDict
 
 import structlog
 
+from .helpers import fast_content_hash
+
 logger = structlog.get_logger(__name__)
 
+# Number of message contents whose validation result is remembered per validator
+CONTENT_CACHE_SIZE = 1024
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+
+# cmd.exe built-ins have no executable of their own, so they need shell=True
+_WINDOWS_SHELL_BUILTINS = frozenset({
+    "assoc", "call", "cd", "chdir", "cls", "color", "copy", "date", "del", "dir",
+    "echo", "erase", "ftype", "md", "mkdir", "mklink", "move", "path", "pause",
+    "popd", "pushd", "rd", "ren", "rename", "rmdir", "set", "start", "time",
+    "title", "type", "ver", "verify", "vol",
+})
+
+# Pipes, command chaining and redirection only mean something to cmd.exe
+_WINDOWS_SHELL_OPERATORS = re.compile(r"[|&<>]")
+
+# Batch-file shims (npm, npx, yarn, code, ...) that CreateProcess can't start directly
+_WINDOWS_SCRIPT_SUFFIXES = (".cmd", ".bat")
+
+
+def _needs_windows_shell(command: List[str]) -> bool:
+    """Whether a Windows command has to run through cmd.exe"""
+    program = command[0]
+    if program.lower() in _WINDOWS_SHELL_BUILTINS:
+        return True
+    if any(_WINDOWS_SHELL_OPERATORS.search(arg) for arg in command):
+        # Spawned directly, these would reach the program as literal arguments
+        return True
+    resolved = shutil.which(program)
+    return resolved is not None and resolved.lower().endswith(_WINDOWS_SCRIPT_SUFFIXES)
+
+
+def _compile_union(patterns: List[str]) -> "re.Pattern[str]":
+    """Compile patterns into a single case-insensitive alternation"""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
 
 class SecurityValidator:
     """
@@ -47,31 +88,74 @@ class SecurityValidator:
     ]
     
     # Safe file extensions
-    SAFE_EXTENSIONS = {
+    SAFE_EXTENSIONS = frozenset({
         '.py', '.js', '.ts', '.java', '.cpp', '.h', '.c', '.cs', '.go',
         '.rs', '.php', '.rb', '.swift', '.kt', '.scala', '.clj', '.hs',
         '.ml', '.r', '.sql', '.html', '.css', '.scss', '.less', '.vue',
         '.jsx', '.tsx', '.json', '.yaml', '.yml', '.xml', '.toml', '.ini',
         '.cfg', '.conf', '.md', '.rst', '.txt', '.log', '.sh', '.bat',
         '.ps1', '.dockerfile', '.makefile', '.cmake', '.gradle'
-    }
+    })
     
     # Allowed domains for web requests
-    ALLOWED_DOMAINS = {
+    ALLOWED_DOMAINS = frozenset({
         'github.com', 'gitlab.com', 'bitbucket.org', 'stackoverflow.com',
         'docs.python.org', 'developer.mozilla.org', 'npmjs.com',
         'pypi.org', 'crates.io', 'maven.apache.org', 'nuget.org'
-    }
+    })
+    
+    # Default patterns compiled once for every validator
+    _DANGEROUS_REGEXES = tuple(re.compile(p, re.IGNORECASE) for p in DANGEROUS_PATTERNS)
+    _DANGEROUS_RE = _compile_union(DANGEROUS_PATTERNS)
     
     def __init__(self, config=None):
         self.config = config
+        self._dangerous_regexes = self._DANGEROUS_REGEXES
+        self._dangerous_re = self._DANGEROUS_RE
         
-        # Update patterns and domains from config if available
+        # Update patterns and domains from config if available. Extend copies
+        # so one validator's config doesn't leak into the class defaults
         if config and hasattr(config, 'security'):
             if hasattr(config.security, 'blocked_commands'):
-                self.DANGEROUS_PATTERNS.extend(config.security.blocked_commands)
+                self.DANGEROUS_PATTERNS = self.DANGEROUS_PATTERNS + list(config.security.blocked_commands)
+                self._dangerous_regexes += tuple(
+                    re.compile(p, re.IGNORECASE) for p in config.security.blocked_commands
+                )
+                self._dangerous_re = _compile_union(self.DANGEROUS_PATTERNS)
             if hasattr(config.security, 'allowed_domains'):
-                self.ALLOWED_DOMAINS.update(config.security.allowed_domains)
+                self.ALLOWED_DOMAINS = self.ALLOWED_DOMAINS | set(config.security.allowed_domains)
+        
+        # Exact domains plus '.domain' suffixes, so subdomain checks are one endswith call
+        self._allowed_set = frozenset(d.lower() for d in self.ALLOWED_DOMAINS)
+        self._allowed_suffixes = tuple('.' + d for d in self._allowed_set)
+        
+        # Content digest -> validate_command result, so repeated prompts skip the regex scan
+        self._content_cache: "OrderedDict[str, bool]" = OrderedDict()
+        
+        # Resolved allowed roots, recomputed only when the working directory changes
+        self._allowed_roots_cwd: Optional[str] = None
+        self._allowed_roots: Tuple[Tuple[str, str], ...] = ()
+    
+    def _get_allowed_roots(self) -> Tuple[Tuple[str, str], ...]:
+        """Return (root, root-with-separator) pairs for the allowed directories"""
+        cwd = os.getcwd()
+        if cwd != self._allowed_roots_cwd:
+            home = Path.home().resolve()
+            roots = []
+            for root in (
+                Path(cwd).resolve(),  # Current working directory
+                home,  # User's home directory
+                home / "Documents",  # Documents folder
+                home / "Desktop",    # Desktop folder
+                home / "Downloads",  # Downloads folder
+            ):
+                root_str = os.path.normcase(str(root))
+                prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+                if (root_str, prefix) not in roots:
+                    roots.append((root_str, prefix))
+            self._allowed_roots = tuple(roots)
+            self._allowed_roots_cwd = cwd
+        return self._allowed_roots
     
     def validate_file_path(self, file_path: Union[str, Path]) -> bool:
         """Validate file path for safety"""
@@ -83,24 +167,12 @@ class SecurityValidator:
                 logger.warning("Directory traversal detected", path=str(path))
                 return False
             
-            # Check if path is within allowed directories
-            allowed_paths = [
-                Path.cwd().resolve(),  # Current working directory
-                Path.home().resolve(),  # User's home directory
-                Path.home().resolve() / "Documents",  # Documents folder
-                Path.home().resolve() / "Desktop",    # Desktop folder
-                Path.home().resolve() / "Downloads",  # Downloads folder
-            ]
-
-            # Allow access to any subdirectory of allowed paths
-            path_allowed = False
-            for allowed_path in allowed_paths:
-                try:
-                    path.relative_to(allowed_path)
-                    path_allowed = True
-                    break
-                except ValueError:
-                    continue
+            # Check if path is within allowed directories (or any subdirectory)
+            path_str = os.path.normcase(str(path))
+            path_allowed = any(
+                path_str == root or path_str.startswith(prefix)
+                for root, prefix in self._get_allowed_roots()
+            )
 
             if not path_allowed:
                 logger.warning("Path outside allowed directories", path=str(path))
@@ -137,14 +209,32 @@ class SecurityValidator:
     
     def validate_command(self, command: str) -> bool:
         """Validate command for dangerous patterns"""
-        command_lower = command.lower()
+        # One scan with the combined pattern; individual patterns are only
+        # checked to report which one matched
+        if not self._dangerous_re.search(command):
+            return True
         
-        for pattern in self.DANGEROUS_PATTERNS:
-            if re.search(pattern, command_lower, re.IGNORECASE):
-                logger.warning("Dangerous command pattern detected", command=command, pattern=pattern)
-                return False
+        pattern = next(
+            (regex.pattern for regex in self._dangerous_regexes if regex.search(command)), None
+        )
+        logger.warning("Dangerous command pattern detected", command=command, pattern=pattern)
+        return False
+    
+    def _validate_content(self, content: str) -> bool:
+        """validate_command for message content, remembering results by content hash"""
+        key = fast_content_hash(content)
+        ok = self._content_cache.get(key)
+        if ok is not None:
+            self._content_cache.move_to_end(key)
+            if not ok:
+                logger.warning("Dangerous command pattern detected", content_hash=key)
+            return ok
         
-        return True
+        ok = self.validate_command(content)
+        self._content_cache[key] = ok
+        if len(self._content_cache) > CONTENT_CACHE_SIZE:
+            self._content_cache.popitem(last=False)
+        return ok
     
     def validate_url(self, url: str) -> bool:
         """Validate URL for safety"""
@@ -158,17 +248,9 @@ class SecurityValidator:
             
             # Check domain
             domain = parsed.netloc.lower()
-            if domain not in self.ALLOWED_DOMAINS:
-                # Check if it's a subdomain of allowed domain
-                allowed = False
-                for allowed_domain in self.ALLOWED_DOMAINS:
-                    if domain.endswith(f'.{allowed_domain}') or domain == allowed_domain:
-                        allowed = True
-                        break
-                
-                if not allowed:
-                    logger.warning("Domain not allowed", url=url, domain=domain)
-                    return False
+            if domain not in self._allowed_set and not domain.endswith(self._allowed_suffixes):
+                logger.warning("Domain not allowed", url=url, domain=domain)
+                return False
             
             return True
             
@@ -206,7 +288,7 @@ class SecurityValidator:
                     return False
                 
                 # Check for dangerous patterns in content
-                if not self.validate_command(content):
+                if not self._validate_content(content):
                     return False
             
             # Validate model
@@ -237,7 +319,7 @@ class SecurityValidator:
     def sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for safe use"""
         # Remove dangerous characters
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        sanitized = _UNSAFE_FILENAME_CHARS.sub('_', filename)
         
         # Remove leading/trailing dots and spaces
         sanitized = sanitized.strip('. ')
@@ -278,27 +360,28 @@ class SecurityValidator:
     
     def validate_json_data(self, data: Any, max_depth: int = 10) -> bool:
         """Validate JSON data for safety"""
-        def check_depth(obj, current_depth=0):
-            if current_depth > max_depth:
-                return False
-            
-            if isinstance(obj, dict):
-                if len(obj) > 1000:  # Limit dict size
+        def check_depth(obj) -> bool:
+            # Explicit stack instead of recursion: no Python frame per nested value
+            stack = [(obj, 0)]
+            while stack:
+                obj, current_depth = stack.pop()
+                if current_depth > max_depth:
                     return False
-                for key, value in obj.items():
-                    if not isinstance(key, str) or len(key) > 1000:
+                
+                if isinstance(obj, dict):
+                    if len(obj) > 1000:  # Limit dict size
                         return False
-                    if not check_depth(value, current_depth + 1):
+                    for key, value in obj.items():
+                        if not isinstance(key, str) or len(key) > 1000:
+                            return False
+                        stack.append((value, current_depth + 1))
+                elif isinstance(obj, list):
+                    if len(obj) > 1000:  # Limit list size
                         return False
-            elif isinstance(obj, list):
-                if len(obj) > 1000:  # Limit list size
-                    return False
-                for item in obj:
-                    if not check_depth(item, current_depth + 1):
+                    stack.extend((item, current_depth + 1) for item in obj)
+                elif isinstance(obj, str):
+                    if len(obj) > 100000:  # 100KB limit for strings
                         return False
-            elif isinstance(obj, str):
-                if len(obj) > 100000:  # 100KB limit for strings
-                    return False
             
             return True
         
@@ -326,11 +409,14 @@ class SecurityValidator:
             raise ValueError(f"Working directory failed validation: {cwd}")
         
         try:
-            # Execute with restrictions
-            import platform
-
-            # On Windows, use shell=True for built-in commands
-            use_shell = platform.system() == "Windows"
+            # On Windows, only cmd.exe built-ins, .cmd/.bat shims and commands using
+            # shell operators go through the shell; plain executables are spawned
+            # directly without a cmd.exe middleman
+            use_shell = (
+                sys.platform == 'win32'
+                and bool(command)
+                and _needs_windows_shell(command)
+            )
 
             result = subprocess.run(
                 command,
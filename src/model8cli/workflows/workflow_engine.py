@@ -5,21 +5,248 @@ Provides multi-step task automation, custom workflow creation, and template syst
 """
 
 import asyncio
+import builtins
+import copy
 import json
+import os
+import pkgutil
+import re
+import sys
+import time
 import yaml
-from typing import Dict, List, Optional, Any, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime
+from functools import lru_cache
+from types import CodeType, MappingProxyType
 
 import structlog
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 from ..core.config import Config
 from ..tools.base import ToolRegistry, ToolResult
+from ..utils.helpers import YamlSafeDumper, YamlSafeLoader
 
 logger = structlog.get_logger(__name__)
 
+_PLACEHOLDER_RE = re.compile(r"\{\{([^{}]+)\}\}")
+
+# Builds a parameter value from (variables, now_strings)
+ParameterBuilder = Callable[[Dict[str, Any], Callable[[], Tuple[str, str]]], Any]
+
+
+def _resolve_placeholder(name: str, variables: Dict[str, Any], now_strings: Callable[[], Tuple[str, str]]) -> str:
+    """Value of one {{name}} placeholder; {{now}} and {{timestamp}} win over variables"""
+    if name == "now":
+        return now_strings()[0]
+    if name == "timestamp":
+        return now_strings()[1]
+    if name in variables:
+        return str(variables[name])
+    return "{{" + name + "}}"
+
+
+def _copy_constant(obj: Any) -> Any:
+    """Copy the containers of a placeholder-free subtree; leaves are shared"""
+    # Slots (container, key) still holding an original container to be replaced by its copy
+    root = [obj]
+    stack = [(root, 0)]
+    while stack:
+        holder, key = stack.pop()
+        value = holder[key]
+        if isinstance(value, dict):
+            copied = holder[key] = dict(value)
+            stack.extend((copied, k) for k, v in copied.items() if isinstance(v, (dict, list)))
+        elif isinstance(value, list):
+            copied = holder[key] = list(value)
+            stack.extend((copied, i) for i, v in enumerate(copied) if isinstance(v, (dict, list)))
+    return root[0]
+
+
+# Compiled parameter nodes: (_CONST, value, copier), (_STR, head, segments),
+# (_DICT, ((key, node), ...)) and (_LIST, (node, ...))
+_CONST, _STR, _DICT, _LIST = range(4)
+
+
+def _compile_leaf(obj: Any) -> tuple:
+    """Compile a non-container parameter value"""
+    if isinstance(obj, str) and "{{" in obj:
+        # split() alternates literal text and placeholder names: [text, name, text, ...]
+        parts = _PLACEHOLDER_RE.split(obj)
+        if len(parts) > 1:
+            return (_STR, parts[0], tuple(zip(parts[1::2], parts[2::2])))
+    return (_CONST, obj, None)
+
+
+def _compile_nodes(obj: Any) -> tuple:
+    """Compile a parameter tree into nodes, children before parents, without recursion"""
+    if not isinstance(obj, (dict, list)):
+        return _compile_leaf(obj)
+    
+    # Depth-first post-order: a container is compiled once all its children are
+    compiled: Dict[int, tuple] = {}
+    in_progress: Set[int] = set()
+    stack = [(obj, False)]
+    while stack:
+        container, children_done = stack.pop()
+        if not children_done:
+            if id(container) in compiled:
+                continue  # Shared subtree, already compiled
+            if id(container) in in_progress:
+                raise ValueError("Workflow parameters contain a reference cycle")
+            in_progress.add(id(container))
+            stack.append((container, True))
+            values = container.values() if isinstance(container, dict) else container
+            stack.extend((value, False) for value in values if isinstance(value, (dict, list)))
+            continue
+        
+        in_progress.discard(id(container))
+        is_dict = isinstance(container, dict)
+        children = []
+        constant = flat = True
+        for key, value in (container.items() if is_dict else enumerate(container)):
+            if isinstance(value, (dict, list)):
+                node = compiled[id(value)]
+                flat = False
+            else:
+                node = _compile_leaf(value)
+            constant = constant and node[0] == _CONST
+            children.append((key, node))
+        
+        if constant:
+            # Nothing to substitute below here: the builder only copies containers
+            copier = (dict.copy if is_dict else list.copy) if flat else _copy_constant
+            compiled[id(container)] = (_CONST, container, copier)
+        elif is_dict:
+            compiled[id(container)] = (_DICT, tuple(children))
+        else:
+            compiled[id(container)] = (_LIST, tuple(node for _, node in children))
+    return compiled[id(obj)]
+
+
+def _render_str(node: tuple, variables: Dict[str, Any], now_strings: Callable[[], Tuple[str, str]]) -> str:
+    """Fill in the placeholders of a compiled string"""
+    out = [node[1]]
+    for name, text in node[2]:
+        out.append(_resolve_placeholder(name, variables, now_strings))
+        out.append(text)
+    return "".join(out)
+
+
+def _build_nodes(root: tuple, variables: Dict[str, Any], now_strings: Callable[[], Tuple[str, str]]) -> Any:
+    """Build a parameter value from compiled nodes, using an explicit stack instead of recursion"""
+    holder = [None]
+    stack = [(root, holder, 0)]
+    while stack:
+        node, dst, key = stack.pop()
+        kind = node[0]
+        if kind == _CONST:
+            dst[key] = node[1] if node[2] is None else node[2](node[1])
+        elif kind == _STR:
+            dst[key] = _render_str(node, variables, now_strings)
+        else:
+            if kind == _DICT:
+                out = dst[key] = {}
+                children = node[1]
+            else:
+                out = dst[key] = [None] * len(node[1])
+                children = enumerate(node[1])
+            for child_key, child in children:
+                # Leaves are filled in directly; the stack only holds containers
+                child_kind = child[0]
+                if child_kind == _CONST and child[2] is None:
+                    out[child_key] = child[1]
+                elif child_kind == _STR:
+                    out[child_key] = _render_str(child, variables, now_strings)
+                else:
+                    # Reserve the key now so dict order matches the source
+                    out[child_key] = None
+                    stack.append((child, out, child_key))
+    return holder[0]
+
+
+def _compile_parameters(obj: Any) -> ParameterBuilder:
+    """Compile a parameter tree into a function that fills in its placeholders"""
+    root = _compile_nodes(obj)
+    kind = root[0]
+    if kind == _CONST:
+        value, copier = root[1], root[2]
+        if copier is None:
+            return lambda variables, now_strings: value
+        return lambda variables, now_strings: copier(value)
+    if kind == _STR:
+        return lambda variables, now_strings: _render_str(root, variables, now_strings)
+    
+    if kind == _DICT and all(node[0] < _DICT for _, node in root[1]):
+        # The common case, a dict of leaves and constant subtrees, skips the stack machinery
+        items = root[1]
+        return lambda variables, now_strings: {
+            key: (
+                _render_str(node, variables, now_strings) if node[0] == _STR
+                else node[1] if node[2] is None else node[2](node[1])
+            )
+            for key, node in items
+        }
+    return lambda variables, now_strings: _build_nodes(root, variables, now_strings)
+
+
+# Slotted dataclasses (no per-instance __dict__) where the interpreter supports them
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Tools that spawn a process per call, and how many of them may run at once
+_COMMAND_TOOLS = frozenset({"execute_command"})
+MAX_CONCURRENT_COMMANDS = os.cpu_count() or 1
+
+# Flushes file data without metadata where the platform supports it
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# Seconds for which one clock read serves all step timestamps and {{now}} expansions
+NOW_CACHE_WINDOW = 0.001
+
+# (epoch minute, "YYYY-mm-ddTHH:MM:", "YYYYmmdd_HHMM") for the last minute formatted
+_clock_minute: Tuple[int, str, str] = (-1, "", "")
+
+
+def _clock_strings() -> Tuple[str, str]:
+    """Local time now as (ISO, YYYYmmdd_HHMMSS) strings; only the seconds are formatted per call"""
+    global _clock_minute
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    minute, second = divmod(seconds, 60)
+    cached = _clock_minute
+    if cached[0] != minute:
+        local = time.localtime(seconds)
+        cached = _clock_minute = (
+            minute,
+            time.strftime("%Y-%m-%dT%H:%M:", local),
+            time.strftime("%Y%m%d_%H%M", local),
+        )
+    return f"{cached[1]}{second:02d}.{nanos // 1000:06d}", f"{cached[2]}{second:02d}"
+
+
+def _iso_now() -> str:
+    """Local time now in ISO 8601 with microseconds"""
+    return _clock_strings()[0]
+
+
+# Builtins available to step conditions
+_CONDITION_BUILTINS = MappingProxyType({
+    name: getattr(builtins, name)
+    for name in ("abs", "all", "any", "bool", "float", "int", "len", "max", "min", "str")
+})
+
+
+@lru_cache(maxsize=256)
+def _compile_condition(condition: str) -> CodeType:
+    """Compile a condition once; re-runs and retries reuse the code object"""
+    return compile(condition, "<condition>", "eval")
+
 
 class WorkflowStatus(Enum):
     """Workflow execution status"""
@@ -39,7 +266,7 @@ class StepStatus(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class WorkflowStep:
     """Individual workflow step"""
     id: str
@@ -51,14 +278,19 @@ class WorkflowStep:
     max_retries: int = 3
     timeout: Optional[int] = None
     on_failure: str = "stop"  # stop, continue, retry
+    depends_on: Optional[List[str]] = None  # None: run after the previous step
     status: StepStatus = StepStatus.PENDING
     result: Optional[ToolResult] = None
     error: Optional[str] = None
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
+    # Parameters compiled into a builder function
+    _compiled_parameters: Optional[Tuple[Any, "ParameterBuilder"]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Workflow:
     """Workflow definition"""
     id: str
@@ -70,10 +302,137 @@ class Workflow:
     steps: List[WorkflowStep] = field(default_factory=list)
     variables: Dict[str, Any] = field(default_factory=dict)
     status: WorkflowStatus = WorkflowStatus.PENDING
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=_iso_now)
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     error: Optional[str] = None
+    # Steps that failed during the current run, in the order they finished
+    _failed: List[WorkflowStep] = field(default_factory=list, init=False, repr=False, compare=False)
+
+
+# Dicts up to this size with only scalar values are shared between read-only trees
+SMALL_DICT_INTERN_SIZE = 8
+_INTERN_LEAF_TYPES = (str, int, float, bool, type(None))
+
+
+def _intern_tree(obj: Any, shared_dicts: Optional[Dict[tuple, Dict[str, Any]]] = None) -> Any:
+    """Copy of a parsed tree with its strings interned
+    
+    With shared_dicts, equal small scalar-only dicts also become one object;
+    only use that for trees nothing mutates.
+    """
+    # Slots (container, key) whose value still has to be interned or copied
+    root = [obj]
+    stack = [(root, 0)]
+    while stack:
+        holder, key = stack.pop()
+        value = holder[key]
+        if type(value) is str:
+            holder[key] = sys.intern(value)
+        elif isinstance(value, list):
+            copied = holder[key] = list(value)
+            stack.extend((copied, i) for i in range(len(copied)))
+        elif isinstance(value, dict):
+            interned = {
+                (sys.intern(name) if type(name) is str else name): item
+                for name, item in value.items()
+            }
+            if (shared_dicts is not None and len(interned) <= SMALL_DICT_INTERN_SIZE
+                    and all(type(item) in _INTERN_LEAF_TYPES for item in interned.values())):
+                for name, item in interned.items():
+                    if type(item) is str:
+                        interned[name] = sys.intern(item)
+                # The value type is part of the key so 1, 1.0 and True stay distinct
+                shared_key = tuple((name, type(item), item) for name, item in interned.items())
+                holder[key] = shared_dicts.setdefault(shared_key, interned)
+            else:
+                holder[key] = interned
+                stack.extend((interned, name) for name in interned)
+    return root[0]
+
+
+# Built-in templates, parsed once from the packaged templates.yaml and shared by all engines
+_TEMPLATES = MappingProxyType(_intern_tree(
+    yaml.load(pkgutil.get_data(__package__, "templates.yaml").decode("utf-8"), Loader=YamlSafeLoader),
+    {},
+))
+
+
+class _WorkflowJournal:
+    """Append-only log of a workflow run's step and workflow status transitions"""
+    
+    __slots__ = ("path", "sync", "_file")
+    
+    def __init__(self, path: Path, sync: bool = False):
+        self.path = path
+        self.sync = sync
+        # Unbuffered, so each entry is a single write()
+        self._file = open(path, 'wb', buffering=0)
+    
+    def record(self, **entry: Any):
+        """Append one transition"""
+        entry["t"] = time.time_ns()
+        if ORJSON_AVAILABLE:
+            line = orjson.dumps(entry) + b"\n"
+        else:
+            line = json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+        try:
+            self._file.write(line)
+            if self.sync:
+                _fdatasync(self._file.fileno())
+        except OSError as e:
+            logger.debug("Failed to write workflow journal", path=str(self.path), error=str(e))
+    
+    def record_step(self, step: WorkflowStep):
+        """Append a step's current status"""
+        self.record(
+            step=step.id,
+            status=step.status.value,
+            error=step.error,
+            started_at=step.started_at,
+            completed_at=step.completed_at,
+        )
+    
+    def record_workflow(self, workflow: Workflow):
+        """Append the workflow's current status"""
+        self.record(
+            status=workflow.status.value,
+            error=workflow.error,
+            started_at=workflow.started_at,
+            completed_at=workflow.completed_at,
+        )
+    
+    def close(self):
+        """Close the journal file"""
+        self._file.close()
+    
+    @staticmethod
+    def replay(path: Path, workflow: Workflow):
+        """Apply the transitions logged for the last run to a loaded workflow"""
+        try:
+            with open(path, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        
+        steps = {step.id: step for step in workflow.steps}
+        for line in lines:
+            try:
+                entry = orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+            except ValueError:
+                continue  # Partially written entry from an interrupted run
+            
+            step_id = entry.get("step")
+            if step_id is None:
+                target, status_type = workflow, WorkflowStatus
+            elif step_id in steps:
+                target, status_type = steps[step_id], StepStatus
+            else:
+                continue
+            target.status = status_type(entry["status"])
+            target.error = entry.get("error")
+            target.started_at = entry.get("started_at")
+            target.completed_at = entry.get("completed_at")
 
 
 class WorkflowEngine:
@@ -85,222 +444,17 @@ class WorkflowEngine:
         self.workflows_dir = config.config_dir / "workflows"
         self.workflows_dir.mkdir(exist_ok=True)
         
-        # Built-in workflow templates
-        self.templates = {
-            "git_feature_workflow": self._create_git_feature_template(),
-            "project_setup": self._create_project_setup_template(),
-            "code_review": self._create_code_review_template(),
-            "deployment": self._create_deployment_template(),
-            "research_workflow": self._create_research_template()
-        }
-    
-    def _create_git_feature_template(self) -> Dict[str, Any]:
-        """Create Git feature workflow template"""
-        return {
-            "name": "Git Feature Workflow",
-            "description": "Complete feature development workflow with Git",
-            "steps": [
-                {
-                    "id": "check_status",
-                    "name": "Check Git Status",
-                    "tool": "git_status",
-                    "parameters": {"path": "."}
-                },
-                {
-                    "id": "create_branch",
-                    "name": "Create Feature Branch",
-                    "tool": "execute_command",
-                    "parameters": {"command": "git checkout -b feature/{{feature_name}}"}
-                },
-                {
-                    "id": "add_changes",
-                    "name": "Add Changes",
-                    "tool": "git_add",
-                    "parameters": {"path": ".", "files": ["."]}
-                },
-                {
-                    "id": "commit_changes",
-                    "name": "Commit Changes",
-                    "tool": "git_commit",
-                    "parameters": {"message": "{{commit_message}}", "add_all": True}
-                },
-                {
-                    "id": "push_branch",
-                    "name": "Push Branch",
-                    "tool": "git_push",
-                    "parameters": {"branch": "feature/{{feature_name}}"}
-                }
-            ],
-            "variables": {
-                "feature_name": "new-feature",
-                "commit_message": "Add new feature"
-            }
-        }
-    
-    def _create_project_setup_template(self) -> Dict[str, Any]:
-        """Create project setup workflow template"""
-        return {
-            "name": "Project Setup Workflow",
-            "description": "Initialize a new project with common structure",
-            "steps": [
-                {
-                    "id": "create_directories",
-                    "name": "Create Project Directories",
-                    "tool": "create_directory",
-                    "parameters": {"path": "{{project_name}}/src", "parents": True}
-                },
-                {
-                    "id": "create_readme",
-                    "name": "Create README",
-                    "tool": "write_file",
-                    "parameters": {
-                        "path": "{{project_name}}/README.md",
-                        "content": "# {{project_name}}\n\n{{project_description}}"
-                    }
-                },
-                {
-                    "id": "create_gitignore",
-                    "name": "Create .gitignore",
-                    "tool": "write_file",
-                    "parameters": {
-                        "path": "{{project_name}}/.gitignore",
-                        "content": "*.pyc\n__pycache__/\n.env\nnode_modules/\n.DS_Store"
-                    }
-                },
-                {
-                    "id": "init_git",
-                    "name": "Initialize Git",
-                    "tool": "execute_command",
-                    "parameters": {"command": "git init {{project_name}}"}
-                }
-            ],
-            "variables": {
-                "project_name": "my-project",
-                "project_description": "A new project"
-            }
-        }
-    
-    def _create_code_review_template(self) -> Dict[str, Any]:
-        """Create code review workflow template"""
-        return {
-            "name": "Code Review Workflow",
-            "description": "Automated code review and analysis",
-            "steps": [
-                {
-                    "id": "analyze_code",
-                    "name": "Analyze Code",
-                    "tool": "analyze_code",
-                    "parameters": {"path": "{{code_path}}", "analysis_type": "detailed"}
-                },
-                {
-                    "id": "format_code",
-                    "name": "Format Code",
-                    "tool": "format_code",
-                    "parameters": {"path": "{{code_path}}"}
-                },
-                {
-                    "id": "lint_code",
-                    "name": "Lint Code",
-                    "tool": "lint_code",
-                    "parameters": {"path": "{{code_path}}"}
-                },
-                {
-                    "id": "run_tests",
-                    "name": "Run Tests",
-                    "tool": "execute_command",
-                    "parameters": {"command": "{{test_command}}"}
-                }
-            ],
-            "variables": {
-                "code_path": "./src",
-                "test_command": "python -m pytest"
-            }
-        }
-    
-    def _create_deployment_template(self) -> Dict[str, Any]:
-        """Create deployment workflow template"""
-        return {
-            "name": "Deployment Workflow",
-            "description": "Deploy application with checks",
-            "steps": [
-                {
-                    "id": "run_tests",
-                    "name": "Run Tests",
-                    "tool": "execute_command",
-                    "parameters": {"command": "{{test_command}}"}
-                },
-                {
-                    "id": "build_app",
-                    "name": "Build Application",
-                    "tool": "execute_command",
-                    "parameters": {"command": "{{build_command}}"}
-                },
-                {
-                    "id": "deploy_app",
-                    "name": "Deploy Application",
-                    "tool": "execute_command",
-                    "parameters": {"command": "{{deploy_command}}"}
-                },
-                {
-                    "id": "health_check",
-                    "name": "Health Check",
-                    "tool": "web_fetch",
-                    "parameters": {"url": "{{health_check_url}}"}
-                }
-            ],
-            "variables": {
-                "test_command": "npm test",
-                "build_command": "npm run build",
-                "deploy_command": "npm run deploy",
-                "health_check_url": "https://myapp.com/health"
-            }
-        }
-    
-    def _create_research_template(self) -> Dict[str, Any]:
-        """Create research workflow template"""
-        return {
-            "name": "Research Workflow",
-            "description": "Comprehensive research and documentation",
-            "steps": [
-                {
-                    "id": "web_search",
-                    "name": "Web Search",
-                    "tool": "web_search",
-                    "parameters": {"query": "{{research_topic}}"}
-                },
-                {
-                    "id": "knowledge_search",
-                    "name": "Search Knowledge Base",
-                    "tool": "knowledge_search",
-                    "parameters": {"query": "{{research_topic}}"}
-                },
-                {
-                    "id": "create_summary",
-                    "name": "Create Research Summary",
-                    "tool": "write_file",
-                    "parameters": {
-                        "path": "research_{{timestamp}}.md",
-                        "content": "# Research: {{research_topic}}\n\nDate: {{timestamp}}\n\n## Findings\n\n{{findings}}"
-                    }
-                },
-                {
-                    "id": "add_to_knowledge",
-                    "name": "Add to Knowledge Base",
-                    "tool": "add_knowledge",
-                    "parameters": {
-                        "title": "Research: {{research_topic}}",
-                        "content": "{{findings}}",
-                        "category": "research",
-                        "tags": ["research", "{{research_topic}}"]
-                    }
-                }
-            ],
-            "variables": {
-                "research_topic": "AI development",
-                "timestamp": "{{now}}",
-                "findings": "Research findings will be populated here"
-            }
-        }
+        # Bounds concurrently running command steps, per event loop
+        self._command_slots: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
+        
+        # (monotonic tick, ISO string, compact string) of the last clock read
+        self._now_cache: Optional[Tuple[float, str, str]] = None
+        
+        # Built-in workflow templates, shared read-only by every engine
+        self.templates = _TEMPLATES
+        
+        # fdatasync the run journal after every entry (slower, survives power loss)
+        self.journal_sync = False
     
     async def execute_workflow(self, workflow: Workflow, variables: Optional[Dict[str, Any]] = None) -> Workflow:
         """Execute a workflow"""
@@ -308,52 +462,37 @@ class WorkflowEngine:
         
         # Update workflow status
         workflow.status = WorkflowStatus.RUNNING
-        workflow.started_at = datetime.now().isoformat()
+        workflow.started_at = _iso_now()
+        workflow._failed.clear()
         
         # Merge variables
         if variables:
             workflow.variables.update(variables)
         
+        journal = self._open_journal(workflow)
+        
         try:
-            for step in workflow.steps:
-                if workflow.status == WorkflowStatus.CANCELLED:
-                    break
-                
-                # Check condition if specified
-                if step.condition and not self._evaluate_condition(step.condition, workflow.variables):
-                    step.status = StepStatus.SKIPPED
-                    continue
-                
-                # Execute step
-                await self._execute_step(step, workflow.variables)
-                
-                # Handle step failure
-                if step.status == StepStatus.FAILED:
-                    if step.on_failure == "stop":
-                        workflow.status = WorkflowStatus.FAILED
-                        workflow.error = step.error
-                        break
-                    elif step.on_failure == "retry" and step.retry_count < step.max_retries:
-                        step.retry_count += 1
-                        step.status = StepStatus.PENDING
-                        await self._execute_step(step, workflow.variables)
+            await self._run_steps(workflow, journal)
             
             # Update final status
             if workflow.status == WorkflowStatus.RUNNING:
-                failed_steps = [s for s in workflow.steps if s.status == StepStatus.FAILED]
-                if failed_steps:
+                if workflow._failed:
                     workflow.status = WorkflowStatus.FAILED
-                    workflow.error = f"Failed steps: {[s.name for s in failed_steps]}"
+                    workflow.error = f"Failed steps: {[s.name for s in workflow._failed]}"
                 else:
                     workflow.status = WorkflowStatus.COMPLETED
             
-            workflow.completed_at = datetime.now().isoformat()
+            workflow.completed_at = _iso_now()
             
         except Exception as e:
             workflow.status = WorkflowStatus.FAILED
             workflow.error = str(e)
-            workflow.completed_at = datetime.now().isoformat()
+            workflow.completed_at = _iso_now()
             logger.error("Workflow execution failed", workflow_id=workflow.id, error=str(e))
+        finally:
+            if journal is not None:
+                journal.record_workflow(workflow)
+                journal.close()
         
         logger.info("Workflow execution completed", 
                    workflow_id=workflow.id, 
@@ -361,21 +500,135 @@ class WorkflowEngine:
         
         return workflow
     
+    def _get_command_slots(self) -> asyncio.Semaphore:
+        """Semaphore limiting concurrent command steps on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._command_slots is None or self._command_slots[0] is not loop:
+            self._command_slots = (loop, asyncio.Semaphore(MAX_CONCURRENT_COMMANDS))
+        return self._command_slots[1]
+    
+    def _now_strings(self) -> Tuple[str, str]:
+        """Current time as (ISO, YYYYmmdd_HHMMSS) strings, shared within NOW_CACHE_WINDOW"""
+        tick = time.monotonic()
+        cached = self._now_cache
+        if cached is None or tick - cached[0] > NOW_CACHE_WINDOW:
+            cached = self._now_cache = (tick, *_clock_strings())
+        return cached[1], cached[2]
+    
+    def _step_dependencies(self, workflow: Workflow) -> Dict[str, Set[str]]:
+        """Map each step id to the ids of the steps it waits for"""
+        step_ids = {step.id for step in workflow.steps}
+        dependencies = {}
+        previous_id = None
+        
+        for step in workflow.steps:
+            if step.depends_on is None:
+                # Steps without explicit dependencies keep the sequential order
+                deps = {previous_id} if previous_id else set()
+            else:
+                deps = set(step.depends_on)
+                unknown = deps - step_ids
+                if unknown:
+                    raise ValueError(f"Step '{step.id}' depends on unknown steps: {sorted(unknown)}")
+            dependencies[step.id] = deps
+            previous_id = step.id
+        
+        return dependencies
+    
+    def _open_journal(self, workflow: Workflow) -> Optional[_WorkflowJournal]:
+        """Start a fresh run journal for a saved workflow; unsaved workflows aren't journaled"""
+        if not (self.workflows_dir / f"{workflow.id}.yaml").exists():
+            return None
+        
+        try:
+            journal = _WorkflowJournal(self.workflows_dir / f"{workflow.id}.log", self.journal_sync)
+        except OSError as e:
+            logger.debug("Failed to open workflow journal", workflow_id=workflow.id, error=str(e))
+            return None
+        
+        journal.record_workflow(workflow)
+        return journal
+    
+    async def _run_steps(self, workflow: Workflow, journal: Optional[_WorkflowJournal] = None):
+        """Run steps as their dependencies finish, independent steps concurrently"""
+        dependencies = self._step_dependencies(workflow)
+        pending = {step.id: step for step in workflow.steps}
+        running: Dict[asyncio.Task, WorkflowStep] = {}
+        done: Set[str] = set()
+        
+        try:
+            while pending or running:
+                if workflow.status == WorkflowStatus.RUNNING:
+                    # Skipped steps count as done, which can make further steps ready
+                    ready = [step_id for step_id in pending if dependencies[step_id] <= done]
+                    while ready:
+                        for step_id in ready:
+                            step = pending.pop(step_id)
+                            if step.condition and not self._evaluate_condition(step.condition, workflow.variables):
+                                step.status = StepStatus.SKIPPED
+                                done.add(step_id)
+                                if journal is not None:
+                                    journal.record_step(step)
+                                continue
+                            task = asyncio.create_task(self._run_step(step, workflow.variables))
+                            running[task] = step
+                        ready = [step_id for step_id in pending if dependencies[step_id] <= done]
+                
+                if not running:
+                    if pending and workflow.status == WorkflowStatus.RUNNING:
+                        raise ValueError(f"Circular step dependencies: {sorted(pending)}")
+                    break
+                
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    step = running.pop(task)
+                    task.result()
+                    done.add(step.id)
+                    if journal is not None:
+                        journal.record_step(step)
+                    
+                    if step.status == StepStatus.FAILED:
+                        workflow._failed.append(step)
+                        
+                        # Stop scheduling new steps; steps already running are allowed to finish
+                        if step.on_failure == "stop" and workflow.status == WorkflowStatus.RUNNING:
+                            workflow.status = WorkflowStatus.FAILED
+                            workflow.error = step.error
+        finally:
+            for task in running:
+                task.cancel()
+    
+    async def _run_step(self, step: WorkflowStep, variables: Dict[str, Any]):
+        """Execute a step, retrying it if its failure policy asks for that"""
+        await self._execute_step(step, variables)
+        
+        if step.status == StepStatus.FAILED and step.on_failure == "retry" and step.retry_count < step.max_retries:
+            step.retry_count += 1
+            step.status = StepStatus.PENDING
+            await self._execute_step(step, variables)
+    
     async def _execute_step(self, step: WorkflowStep, variables: Dict[str, Any]):
         """Execute a single workflow step"""
         logger.info("Executing step", step_id=step.id, step_name=step.name)
         
         step.status = StepStatus.RUNNING
-        step.started_at = datetime.now().isoformat()
+        step.started_at = self._now_strings()[0]
         
         try:
             # Substitute variables in parameters
-            parameters = self._substitute_variables(step.parameters, variables)
+            parameters = self._expand_parameters(step, variables)
             
             # Get tool and execute
-            if step.tool in self.tool_registry.tools:
-                tool = self.tool_registry.tools[step.tool]
-                result = await tool.execute(**parameters)
+            tool = self.tool_registry.tools.get(step.tool)
+            if tool is None:
+                step.status = StepStatus.FAILED
+                step.error = f"Tool '{step.tool}' not found"
+            else:
+                if step.tool in _COMMAND_TOOLS:
+                    async with self._get_command_slots():
+                        result = await tool.execute(**parameters)
+                else:
+                    result = await tool.execute(**parameters)
                 step.result = result
                 
                 if result.success:
@@ -386,50 +639,41 @@ class WorkflowEngine:
                 else:
                     step.status = StepStatus.FAILED
                     step.error = result.error
-            else:
-                step.status = StepStatus.FAILED
-                step.error = f"Tool '{step.tool}' not found"
             
-            step.completed_at = datetime.now().isoformat()
+            step.completed_at = self._now_strings()[0]
             
         except Exception as e:
             step.status = StepStatus.FAILED
             step.error = str(e)
-            step.completed_at = datetime.now().isoformat()
+            step.completed_at = self._now_strings()[0]
             logger.error("Step execution failed", step_id=step.id, error=str(e))
     
-    def _substitute_variables(self, obj: Any, variables: Dict[str, Any]) -> Any:
-        """Substitute variables in object"""
-        if isinstance(obj, str):
-            # Handle special variables
-            if "{{now}}" in obj:
-                obj = obj.replace("{{now}}", datetime.now().isoformat())
-            if "{{timestamp}}" in obj:
-                obj = obj.replace("{{timestamp}}", datetime.now().strftime("%Y%m%d_%H%M%S"))
-            
-            # Substitute user variables
-            for key, value in variables.items():
-                placeholder = f"{{{{{key}}}}}"
-                if placeholder in obj:
-                    obj = obj.replace(placeholder, str(value))
-            return obj
-        elif isinstance(obj, dict):
-            return {k: self._substitute_variables(v, variables) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._substitute_variables(item, variables) for item in obj]
-        else:
-            return obj
+    def _expand_parameters(self, step: WorkflowStep, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Substitute variables in a step's parameters, building a fresh copy each run"""
+        compiled = step._compiled_parameters
+        if compiled is None or compiled[0] is not step.parameters:
+            # The parameter tree is walked once; later runs only call the builder
+            compiled = step._compiled_parameters = (step.parameters, _compile_parameters(step.parameters))
+        return compiled[1](variables, self._now_strings)
     
     def _evaluate_condition(self, condition: str, variables: Dict[str, Any]) -> bool:
         """Evaluate a simple condition"""
         # Simple condition evaluation (can be extended)
         try:
             # Replace variables in condition
-            for key, value in variables.items():
-                condition = condition.replace(f"{{{{{key}}}}}", str(value))
+            if "{{" in condition:
+                condition = _PLACEHOLDER_RE.sub(
+                    lambda m: str(variables[m.group(1)]) if m.group(1) in variables else m.group(0),
+                    condition,
+                )
             
-            # Evaluate simple expressions
-            return eval(condition)
+            # Variables are also visible by name; the read-only view keeps
+            # assignment expressions from writing back into them
+            return bool(eval(
+                _compile_condition(condition),
+                {"__builtins__": _CONDITION_BUILTINS},
+                MappingProxyType(variables),
+            ))
         except Exception:
             return True  # Default to true if condition can't be evaluated
     
@@ -456,21 +700,63 @@ class WorkflowEngine:
                         "condition": step.condition,
                         "max_retries": step.max_retries,
                         "timeout": step.timeout,
-                        "on_failure": step.on_failure
+                        "on_failure": step.on_failure,
+                        "depends_on": step.depends_on
                     }
                     for step in workflow.steps
                 ]
             }
             
             with open(workflow_file, 'w', encoding='utf-8') as f:
-                yaml.dump(workflow_dict, f, default_flow_style=False, indent=2)
+                yaml.dump(workflow_dict, f, Dumper=YamlSafeDumper, default_flow_style=False, indent=2)
             
+            self._write_json_sidecar(workflow_file, workflow_dict)
             return True
             
         except Exception as e:
             logger.error("Failed to save workflow", workflow_id=workflow.id, error=str(e))
             return False
     
+    def _write_json_sidecar(self, workflow_file: Path, workflow_dict: Dict[str, Any]):
+        """Write a JSON copy of a workflow next to its YAML for faster loading
+        
+        The copy records the YAML's mtime and size; it is only used while both
+        still match, so a replaced YAML is never shadowed by a stale copy.
+        """
+        if not ORJSON_AVAILABLE:
+            return
+        
+        try:
+            st = workflow_file.stat()
+            workflow_file.with_suffix(".json").write_bytes(orjson.dumps(
+                {
+                    "yaml_mtime_ns": st.st_mtime_ns,
+                    "yaml_size": st.st_size,
+                    "workflow": workflow_dict,
+                },
+                option=orjson.OPT_INDENT_2,
+            ))
+        except Exception as e:
+            logger.debug("Failed to write workflow JSON cache", path=str(workflow_file), error=str(e))
+    
+    def _read_workflow_file(self, workflow_file: Path) -> Dict[str, Any]:
+        """Read a workflow, preferring its JSON copy while that matches the YAML"""
+        if ORJSON_AVAILABLE:
+            try:
+                st = workflow_file.stat()
+                cached = orjson.loads(workflow_file.with_suffix(".json").read_bytes())
+                if (cached.get("yaml_mtime_ns") == st.st_mtime_ns
+                        and cached.get("yaml_size") == st.st_size):
+                    return cached["workflow"]
+            except (OSError, orjson.JSONDecodeError, AttributeError, KeyError):
+                pass
+        
+        # YAML is the source of truth; refresh the JSON copy after it changed
+        with open(workflow_file, 'r', encoding='utf-8') as f:
+            workflow_dict = yaml.load(f, Loader=YamlSafeLoader)
+        self._write_json_sidecar(workflow_file, workflow_dict)
+        return workflow_dict
+    
     def load_workflow(self, workflow_id: str) -> Optional[Workflow]:
         """Load workflow from file"""
         try:
@@ -479,21 +765,23 @@ class WorkflowEngine:
             if not workflow_file.exists():
                 return None
             
-            with open(workflow_file, 'r', encoding='utf-8') as f:
-                workflow_dict = yaml.safe_load(f)
+            workflow_dict = self._read_workflow_file(workflow_file)
             
             # Convert dict to workflow
             steps = []
             for step_dict in workflow_dict.get("steps", []):
+                # Interned ids and names make the scheduler's id lookups and
+                # repeated parameter strings cheaper; dicts stay per step
                 step = WorkflowStep(
-                    id=step_dict["id"],
+                    id=_intern_tree(step_dict["id"]),
                     name=step_dict["name"],
-                    tool=step_dict["tool"],
-                    parameters=step_dict["parameters"],
+                    tool=_intern_tree(step_dict["tool"]),
+                    parameters=_intern_tree(step_dict["parameters"]),
                     condition=step_dict.get("condition"),
                     max_retries=step_dict.get("max_retries", 3),
                     timeout=step_dict.get("timeout"),
-                    on_failure=step_dict.get("on_failure", "stop")
+                    on_failure=step_dict.get("on_failure", "stop"),
+                    depends_on=_intern_tree(step_dict.get("depends_on"))
                 )
                 steps.append(step)
             
@@ -508,6 +796,9 @@ class WorkflowEngine:
                 steps=steps
             )
             
+            # Restore the state of the last run from its journal
+            _WorkflowJournal.replay(workflow_file.with_suffix(".log"), workflow)
+            
             return workflow
             
         except Exception as e:
@@ -518,14 +809,18 @@ class WorkflowEngine:
         """List available workflows"""
         workflows = []
         
-        # Add saved workflows
-        for workflow_file in self.workflows_dir.glob("*.yaml"):
-            workflows.append(workflow_file.stem)
+        # Add saved workflows; scandir entries avoid a Path and a glob match per file
+        with os.scandir(self.workflows_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(".yaml") and len(name) > 5 and entry.is_file():
+                    workflows.append(name[:-5])
         
         # Add templates
         workflows.extend(self.templates.keys())
         
-        return sorted(workflows)
+        workflows.sort()
+        return workflows
     
     def get_template(self, template_name: str) -> Optional[Dict[str, Any]]:
         """Get workflow template"""
@@ -537,23 +832,26 @@ class WorkflowEngine:
         if not template:
             return None
         
-        # Create workflow steps
+        # Create workflow steps. Templates are shared by every engine, so the
+        # workflow gets its own copies of anything mutable
         steps = []
         for step_dict in template["steps"]:
+            depends_on = step_dict.get("depends_on")
             step = WorkflowStep(
                 id=step_dict["id"],
                 name=step_dict["name"],
                 tool=step_dict["tool"],
-                parameters=step_dict["parameters"],
+                parameters=copy.deepcopy(step_dict["parameters"]),
                 condition=step_dict.get("condition"),
                 max_retries=step_dict.get("max_retries", 3),
                 timeout=step_dict.get("timeout"),
-                on_failure=step_dict.get("on_failure", "stop")
+                on_failure=step_dict.get("on_failure", "stop"),
+                depends_on=list(depends_on) if depends_on is not None else None
             )
             steps.append(step)
         
         # Merge variables
-        workflow_variables = template.get("variables", {})
+        workflow_variables = dict(template.get("variables", {}))
         if variables:
             workflow_variables.update(variables)
         